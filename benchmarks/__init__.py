@@ -0,0 +1,13 @@
+"""Benchmarks for productivity_timer.
+
+generate_log writes deterministic synthetic logs of any size, and run
+times every public entry point against them:
+
+    python -m benchmarks.generate_log productivity_log.csv --rows 1000000
+    python -m benchmarks.run --rows 10000 1000000 --output results.json
+    python -m benchmarks.run --rows 10000 --compare results.json
+
+startup checks that one-shot commands start fast and import nothing heavy:
+
+    python -m benchmarks.startup --compare startup.json
+"""
@@ -0,0 +1,116 @@
+"""Deterministic generator for synthetic productivity_log.csv files."""
+
+import argparse
+import bisect
+import csv
+import math
+import random
+from datetime import date, datetime
+
+import productivity_timer as pt
+
+
+def _format_duration(seconds):
+    # Same text as str(timedelta(seconds=seconds)) without building a timedelta
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    clock = f'{hours}:{minutes:02d}:{seconds:02d}'
+    if days:
+        return f"{days} day{'s' if days != 1 else ''}, {clock}"
+    return clock
+
+
+def _format_clock(seconds):
+    hours, seconds = divmod(seconds % 86400, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f'{hours:02d}:{minutes:02d}:{seconds:02d}'
+
+
+def generate_log(path, rows, projects=10, tasks=20, mean_minutes=45.0, sigma=0.8,
+                 legacy_fraction=0.0, malformed_fraction=0.0,
+                 start=datetime(2016, 1, 1, 8), seed=0):
+    """Write `rows` chronological sessions to `path` and return the number written.
+
+    Session lengths are log-normal with the given mean (in minutes) and
+    shape `sigma`; projects and tasks are picked with Zipf-like weights so a
+    few dominate, as in real logs. A `legacy_fraction` of rows leave the
+    integer columns empty like logs written before they existed, and a
+    `malformed_fraction` carry the kinds of damage readers must skip.
+    The same arguments always produce the same file.
+    """
+    rng = random.Random(seed)
+    names = [(f'Project {p:03d}', [f'Task {t:03d}' for t in range(tasks)]) for p in range(projects)]
+    project_weights = _cumulative_zipf(projects)
+    task_weights = _cumulative_zipf(tasks)
+    mu = math.log(mean_minutes * 60) - sigma ** 2 / 2
+    dates = {}
+
+    clock = pt.to_epoch(start)
+    with open(path, 'w', newline='', buffering=1 << 20) as f:
+        writer = csv.writer(f)
+        writer.writerow(pt.LOG_FIELDNAMES)
+        for _ in range(rows):
+            duration = max(1, int(rng.lognormvariate(mu, sigma)))
+            project, project_tasks = names[bisect.bisect(project_weights, rng.random())]
+            task = project_tasks[bisect.bisect(task_weights, rng.random())]
+
+            day = clock // pt.DAY
+            date_str = dates.get(day)
+            if date_str is None:
+                date_str = dates[day] = date.fromordinal(day + pt.EPOCH_ORDINAL).isoformat()
+            row = [date_str, project, task, _format_clock(clock), _format_clock(clock + duration),
+                   _format_duration(duration), clock, duration]
+
+            roll = rng.random()
+            if roll < malformed_fraction:
+                damage = rng.randrange(4)
+                if damage == 0:
+                    row = row[:3]  # truncated line
+                elif damage == 1:
+                    row[0], row[6:] = 'not-a-date', ['', '']
+                elif damage == 2:
+                    row[5], row[6:] = 'garbage', ['', '']
+                else:
+                    row[3], row[6:] = '25:61', ['', '']
+            elif roll < malformed_fraction + legacy_fraction:
+                row[6:] = ['', '']
+            writer.writerow(row)
+
+            # Mostly short breaks, with the occasional overnight gap
+            clock += duration + int(rng.expovariate(1 / 1800))
+            if rng.random() < 0.1:
+                clock += rng.randrange(8 * 3600, 16 * 3600)
+    return rows
+
+
+def _cumulative_zipf(n):
+    weights = [1 / (rank + 1) for rank in range(n)]
+    total = sum(weights)
+    cumulative, running = [], 0.0
+    for weight in weights[:-1]:
+        running += weight / total
+        cumulative.append(running)
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a synthetic productivity log for benchmarking.')
+    parser.add_argument('path', help='CSV file to write.')
+    parser.add_argument('--rows', type=int, default=10000, help='Number of rows (default 10000).')
+    parser.add_argument('--projects', type=int, default=10, help='Number of projects (default 10).')
+    parser.add_argument('--tasks', type=int, default=20, help='Tasks per project (default 20).')
+    parser.add_argument('--mean-minutes', type=float, default=45.0, help='Mean session length in minutes (default 45).')
+    parser.add_argument('--sigma', type=float, default=0.8, help='Log-normal shape of session lengths (default 0.8).')
+    parser.add_argument('--legacy-fraction', type=float, default=0.0, help='Fraction of rows without the integer columns.')
+    parser.add_argument('--malformed-fraction', type=float, default=0.0, help='Fraction of damaged rows.')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default 0).')
+    args = parser.parse_args()
+
+    generate_log(args.path, args.rows, args.projects, args.tasks, args.mean_minutes, args.sigma,
+                 args.legacy_fraction, args.malformed_fraction, seed=args.seed)
+    print(f"Wrote {args.rows} rows to {args.path}.")
+
+
+if __name__ == '__main__':
+    main()
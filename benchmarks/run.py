@@ -0,0 +1,195 @@
+"""Time productivity_timer's entry points on synthetic logs of growing size.
+
+Each entry point is timed once on its own and, unless --no-memory is
+given, run a second time under tracemalloc for its peak allocation.
+Results are written as JSON; --compare checks them against an earlier run
+and exits with status 1 when anything slowed down past --threshold.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from rich.console import Console
+from rich.table import Table
+
+import productivity_timer as pt
+from benchmarks.generate_log import generate_log
+
+DEFAULT_ROWS = [10_000, 1_000_000, 10_000_000]
+APPENDS = 1000  # log_session calls timed per size
+
+
+def _drop_index():
+    index_file = pt._index_path(pt.LOG_FILE)
+    if os.path.exists(index_file):
+        os.remove(index_file)
+
+
+def _append_sessions():
+    start = datetime(2030, 1, 1, 9)
+    for i in range(APPENDS):
+        begin = start + timedelta(minutes=i)
+        pt.log_session('Project 000', 'Task 000', begin, begin + timedelta(seconds=30))
+
+
+# (name, setup, run, operations per run); operations of None means the log's row count
+ENTRY_POINTS = [
+    ('get_historical_time (cold index)', _drop_index,
+     lambda: pt.get_historical_time('Project 000', 'Task 000'), None),
+    ('get_historical_time (warm index)', None,
+     lambda: pt.get_historical_time('Project 000', 'Task 000'), None),
+    ('generate_summary_report', None, lambda: pt.generate_summary_report(), None),
+    ('generate_project_report', None, lambda: pt.generate_project_report('Project 000'), None),
+    ('generate_hourly_graph', None, lambda: pt.generate_hourly_graph(), None),
+    ('generate_daily_graph', None, lambda: pt.generate_daily_graph(), None),
+    ('generate_recent_history_graph', None, lambda: pt.generate_recent_history_graph(), None),
+    ('load_report_data (single pass)', None, lambda: pt.load_report_data(), None),
+    ('SessionStore.load', None, lambda: pt.SessionStore.load(), None),
+    # Appends grow the log, so they run last
+    (f'log_session x{APPENDS}', None, _append_sessions, APPENDS),
+]
+
+
+def _measure(setup, run, memory):
+    if setup is not None:
+        setup()
+    gc.collect()
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+
+    peak = None
+    if memory:
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return seconds, peak
+
+
+def run_benchmarks(row_counts, storage='csv', memory=True, seed=0, progress=print):
+    results = []
+    original_dir = os.getcwd()
+    original_console = pt.console
+    for rows in row_counts:
+        with tempfile.TemporaryDirectory() as workdir, open(os.devnull, 'w') as devnull:
+            os.chdir(workdir)
+            # Render to /dev/null so rich's rendering cost is still counted
+            pt.console = Console(file=devnull, width=120)
+            pt._storage = None
+            try:
+                progress(f"Generating {rows:,} rows...")
+                generate_log(pt.LOG_FILE, rows, seed=seed)
+                if storage != pt.CSVStorage.name:
+                    pt.migrate_csv(storage)
+                    pt._storage = None
+                for name, setup, run, operations in ENTRY_POINTS:
+                    seconds, peak = _measure(setup, run, memory)
+                    operations = rows if operations is None else operations
+                    results.append({
+                        'rows': rows,
+                        'entry_point': name,
+                        'seconds': seconds,
+                        'operations_per_second': operations / seconds if seconds else None,
+                        'peak_memory_bytes': peak,
+                    })
+                    progress(f"  {name}: {seconds:.3f}s")
+            finally:
+                pt.console = original_console
+                pt._storage = None
+                os.chdir(original_dir)
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': pt._numpy() is not None,
+        'storage': storage,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def print_results(report, baseline=None, threshold=0.10):
+    """Print a results table, with ratios against `baseline` if given.
+
+    Returns the number of entries slower than the baseline by more than
+    `threshold` (a fraction).
+    """
+    previous = {}
+    if baseline is not None:
+        previous = {(r['rows'], r['entry_point']): r for r in baseline['results']}
+
+    table = Table(title=f"Benchmarks ({report['storage']} storage, numpy={report['numpy']})")
+    table.add_column("Rows", justify="right", style="cyan")
+    table.add_column("Entry point", style="magenta")
+    table.add_column("Seconds", justify="right", style="green")
+    table.add_column("Ops/s", justify="right")
+    table.add_column("Peak memory", justify="right")
+    if baseline is not None:
+        table.add_column("vs baseline", justify="right")
+
+    regressions = 0
+    for result in report['results']:
+        peak = result['peak_memory_bytes']
+        ops = result['operations_per_second']
+        row = [f"{result['rows']:,}", result['entry_point'], f"{result['seconds']:.3f}",
+               '-' if ops is None else f"{ops:,.0f}",
+               '-' if peak is None else f"{peak / 2**20:.1f} MiB"]
+        if baseline is not None:
+            before = previous.get((result['rows'], result['entry_point']))
+            if before is None or not before['seconds']:
+                row.append('new')
+            else:
+                ratio = result['seconds'] / before['seconds']
+                slower = ratio > 1 + threshold
+                regressions += slower
+                row.append(f"[{'bold red' if slower else 'green'}]{ratio:.2f}x[/]")
+        table.add_row(*row)
+    Console().print(table)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark productivity_timer on synthetic logs.')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_ROWS, metavar='N',
+                        help='Log sizes to benchmark (default: 10k, 1M and 10M rows).')
+    parser.add_argument('--storage', choices=sorted(pt.STORAGE_BACKENDS), default=pt.CSVStorage.name,
+                        help='Storage backend to benchmark (default csv).')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak-memory runs.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic logs (default 0).')
+    parser.add_argument('--output', metavar='PATH', help='Write the results as JSON to PATH.')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against an earlier JSON results file.')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Slowdown fraction counted as a regression with --compare (default 0.10).')
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.rows, args.storage, not args.no_memory, args.seed)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_results(report, baseline, args.threshold)
+    if regressions:
+        print(f"{regressions} entry point(s) regressed by more than {args.threshold:.0%}.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
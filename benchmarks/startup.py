@@ -0,0 +1,145 @@
+"""Guard the start-up time of productivity_timer's one-shot commands.
+
+Each command runs in a fresh interpreter from an empty directory. Its wall
+time is the median of --runs runs. A separate run under `python -X
+importtime` gives the total import time and the list of modules loaded.
+A command fails the check if it loads a heavy module that only the timer
+or rendered reports need. With --compare, it also fails if it became
+slower than a saved run by more than --threshold.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'productivity_timer.py')
+
+# (name, arguments after the script); None runs `import productivity_timer` instead
+COMMANDS = [
+    ('import productivity_timer', None),
+    ('--help', ['--help']),
+    ('--set-interval', ['--set-interval', '25']),
+    ('--set-storage', ['--set-storage', 'csv']),
+    ('--ctl status (no daemon)', ['--ctl', 'status']),
+    ('--report --format json (no log)', ['--report', '--format', 'json']),
+]
+
+# Packages the commands above must not import
+HEAVY_MODULES = ['rich', 'numpy', 'sqlite3', 'multiprocessing', 'concurrent', 'cProfile']
+
+
+def _command_line(arguments, importtime=False):
+    flags = ['-X', 'importtime'] if importtime else []
+    if arguments is None:
+        return [sys.executable, *flags, '-c', 'import productivity_timer']
+    return [sys.executable, *flags, SCRIPT, *arguments]
+
+
+def _import_profile(arguments, cwd, env):
+    """Return (total import microseconds, set of top-level packages imported)."""
+    result = subprocess.run(_command_line(arguments, importtime=True), cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    total = 0
+    packages = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        packages.add(name.strip().split('.')[0])
+        if not name.startswith('  '):
+            total += int(cumulative)  # top-level imports only, so nothing counts twice
+    return total, packages
+
+
+def measure_startup(runs=5):
+    """Time every command; returns a JSON-serializable report."""
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(SCRIPT))
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, arguments in COMMANDS:
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                subprocess.run(_command_line(arguments), cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                timings.append(time.perf_counter() - started)
+            import_us, packages = _import_profile(arguments, workdir, env)
+            results.append({
+                'command': name,
+                'seconds': statistics.median(timings),
+                'import_seconds': import_us / 1e6,
+                'heavy_imports': sorted(packages.intersection(HEAVY_MODULES)),
+            })
+    return {'python': sys.version.split()[0], 'runs': runs, 'results': results}
+
+
+def print_results(report, baseline=None, threshold=0.10):
+    """Print a results table and return the number of failed checks."""
+    previous = {}
+    if baseline is not None:
+        previous = {r['command']: r for r in baseline['results']}
+
+    table = Table(title=f"Start-up time (median of {report['runs']} runs)")
+    table.add_column("Command", style="magenta")
+    table.add_column("Wall ms", justify="right", style="green")
+    table.add_column("Import ms", justify="right")
+    table.add_column("Heavy imports")
+    if baseline is not None:
+        table.add_column("vs baseline", justify="right")
+
+    failures = 0
+    for result in report['results']:
+        heavy = result['heavy_imports']
+        failures += bool(heavy)
+        row = [result['command'], f"{result['seconds'] * 1000:.1f}", f"{result['import_seconds'] * 1000:.1f}",
+               f"[bold red]{', '.join(heavy)}[/]" if heavy else "[green]none[/]"]
+        if baseline is not None:
+            before = previous.get(result['command'])
+            if before is None or not before['seconds']:
+                row.append('new')
+            else:
+                ratio = result['seconds'] / before['seconds']
+                slower = ratio > 1 + threshold
+                failures += slower
+                row.append(f"[{'bold red' if slower else 'green'}]{ratio:.2f}x[/]")
+        table.add_row(*row)
+    Console().print(table)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the start-up time of productivity_timer commands.')
+    parser.add_argument('--runs', type=int, default=5, help='Runs per command; the median is reported (default 5).')
+    parser.add_argument('--output', metavar='PATH', help='Write the results as JSON to PATH.')
+    parser.add_argument('--compare', metavar='BASELINE', help='Compare against an earlier JSON results file.')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Slowdown fraction counted as a regression with --compare (default 0.10).')
+    args = parser.parse_args()
+
+    report = measure_startup(args.runs)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    failures = print_results(report, baseline, args.threshold)
+    if failures:
+        print(f"{failures} start-up check(s) failed.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
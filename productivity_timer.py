@@ -1,4 +1,5 @@
 import argparse
+import contextlib
 import time
 import json
 import os
@@ -7,20 +8,110 @@ import sys
 import select
 import tty
 import termios
-from datetime import datetime, timedelta
+import re
+import fcntl
+import glob
+import heapq
+import io
+import shlex
+import signal
+import mmap
+import struct
+from array import array
+from datetime import date, datetime, timedelta
 from collections import defaultdict
-from rich.progress import Progress, BarColumn, TextColumn
-from rich.panel import Panel
-from rich.live import Live
-from rich.console import Console, Group
-from rich.layout import Layout
-from rich.table import Table
-from rich.text import Text
 
-console = Console()
+# rich, numpy, sqlite3, socket, cProfile and multiprocessing are imported
+# where they are used: one-line commands run from shell prompts and hooks
+# should not pay for loading them.
+
+
+class _LazyConsole:
+    """Forwards to a rich Console created, and rich imported, on first use."""
+
+    def __init__(self, stderr=False):
+        self._console = None
+        self._stderr = stderr
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+            self._console = Console(stderr=self._stderr)
+        return getattr(self._console, name)
+
+
+MARKUP_TAG = re.compile(r'\[/?[a-z][\w .#-]*\]|\[/\]')
+
+
+class _PlainConsole:
+    """Console for commands that only print status lines: plain print() with rich markup removed."""
+
+    def print(self, *objects, **kwargs):
+        print(*(MARKUP_TAG.sub('', str(obj)) for obj in objects))
+
+
+console = _LazyConsole()
+
+np = None  # numpy, once _numpy() has found it
+_numpy_missing = False
+
+
+def _numpy():
+    """Return numpy, imported on first use, or None if it isn't installed.
+
+    It is optional and only speeds up aggregating the binary log.
+    """
+    global np, _numpy_missing
+    if np is None and not _numpy_missing:
+        try:
+            import numpy
+        except ImportError:
+            _numpy_missing = True
+        else:
+            np = numpy
+    return np
 
 CONFIG_FILE = 'config.json'
 LOG_FILE = 'productivity_log.csv'
+INDEX_VERSION = 1
+SIDECAR_VERSION = 4  # bumped when row parsing or the sidecar fields change, so .idx/.rollup files are rebuilt
+DB_FILE = 'productivity_log.db'
+SOCKET_FILE = 'productivity_timer.sock'
+JOURNAL_DIR = 'productivity_journal'
+CHECKPOINT_SECONDS = 15  # how often a running segment is checkpointed
+FSYNC_SECONDS = 60       # at most one fsync of the journal per this many seconds
+CLIENT_TIMEOUT = 2.0     # seconds the daemon waits on one client's command or reply
+MIN_ACCEPT_TIMEOUT = 0.05  # shortest wait for a client, since a timeout of 0 means non-blocking
+BIN_FILE = 'productivity_log.bin'
+PARTITION_DIR = 'logs'
+PARTITION_NAME = re.compile(r'^(\d{4})-(\d{2})\.csv$')
+NAMES_FILE = 'productivity_log.names.json'
+BIN_ROLLUP_FILE = 'productivity_log.bin.rollup'  # daily rollup of the binary log
+IMPORT_BATCH = 50000  # sessions written per append_many call during --import
+# --archive compression -> extension of the segment files it writes
+ARCHIVE_COMPRESSIONS = {'gzip': '.csv.gz', 'lzma': '.csv.xz'}
+LEGACY_LOG_FIELDNAMES = ['Date', 'Project', 'Task', 'Start Time', 'End Time', 'Duration']
+# Start Epoch / Duration Seconds repeat the readable columns as integers so readers skip text parsing
+LOG_FIELDNAMES = LEGACY_LOG_FIELDNAMES + ['Start Epoch', 'Duration Seconds']
+LOW_POWER_REFRESH_RATE = 0.1  # one redraw every 10 seconds
+MAX_TIMERS = 9  # one per digit key on the multi-timer screen
+PROFILE_FILE = 'productivity_profile.json'
+DAYS_OF_WEEK = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+REPORT_FORMATS = ['json', 'csv', 'ndjson']
+# Columns of --format csv; each section fills the ones that apply to it
+REPORT_FIELDNAMES = ['section', 'user', 'project', 'task', 'date', 'weekday', 'hour', 'seconds']
+
+# Origin of the wall-clock epoch used for integer start times
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+HOUR = 3600
+DAY = 86400
+# 1969-12-29 was a Monday, so weekday bins measured from here start on Monday
+MONDAY_ORIGIN = -3 * DAY
+# Rows are appended when a segment ends, so their start times are only
+# roughly sorted; date-window searches allow this much disorder.
+ORDER_SLACK = DAY
+MAX_RUNS = 64  # ordered stretches tracked per log (see _track_runs)
 
 def load_config():
     if os.path.exists(CONFIG_FILE):
@@ -32,87 +123,2326 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
         json.dump(config, f, indent=4)
 
-def parse_duration(duration_str):
+def parse_duration_seconds(duration_str):
+    """Whole seconds in a str(timedelta) value such as "1 day, 2:03:04.5", or 0 if malformed."""
     try:
         # Handle cases with days (e.g., "1 day, 0:00:00")
+        days = 0
         if ',' in duration_str:
-            days_str, time_str = duration_str.split(', ')
+            days_str, duration_str = duration_str.split(', ')
             days = int(days_str.split()[0])
+
+        # Microseconds are dropped
+        hours, minutes, seconds = duration_str.partition('.')[0].split(':')[:3]
+        return days * 86400 + int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+    except ValueError:
+        return 0
+
+def parse_duration(duration_str):
+    return timedelta(seconds=parse_duration_seconds(duration_str))
+
+def _log_fingerprint(f, offset):
+    """Hex of the bytes just before `offset`, used to spot a log rewritten in place."""
+    start = max(0, offset - 64)
+    f.seek(start)
+    return f.read(offset - start).hex()
+
+def _index_path(log_file):
+    """The sidecar index of a CSV log: productivity_log.csv -> productivity_log.idx."""
+    return os.path.splitext(log_file)[0] + '.idx'
+
+def _load_log_index(index_file, version=INDEX_VERSION):
+    try:
+        with open(index_file, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get('version') != version:
+        return None
+    return index
+
+def _save_log_index(index, index_file):
+    tmp_file = index_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_file, index_file)
+
+def _update_sidecar(log_file, sidecar_file, empty, consume, save=True):
+    """Bring an incremental sidecar of `log_file` up to date and return it.
+
+    A sidecar stores the byte offset it has read the log up to, so only rows
+    appended since the last call are parsed. The sidecar is rebuilt from
+    scratch when the log was replaced (another device and inode), truncated,
+    or rewritten: the bytes before the stored offset changed, or the log was
+    modified without growing since the sidecar was saved. It is also
+    rebuilt when it lacks one of its fields. `empty` is a dict of the
+    sidecar's own fields for a fresh start and `consume(sidecar, rows)` folds
+    new csv rows into them. With `save` False the updated sidecar is only
+    returned, for logs that aren't ours to write next to. Returns None when
+    there is no log file.
+    """
+    if not os.path.isfile(log_file):
+        return None
+
+    index = _load_log_index(sidecar_file, SIDECAR_VERSION)
+    with open(log_file, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        size, identity = stat.st_size, [stat.st_dev, stat.st_ino]
+        if (index is None or index['offset'] > size or not empty.keys() <= index.keys()
+                or index['identity'] != identity
+                or index['offset'] == size and index['mtime'] != stat.st_mtime_ns
+                or _log_fingerprint(f, index['offset']) != index['fingerprint']):
+            index = {'version': SIDECAR_VERSION, 'offset': 0, 'fingerprint': '', 'identity': identity,
+                     'mtime': None, 'header': None, 'outdated_format': False, **empty}
+        if index['offset'] == size:
+            return index
+        start = index['offset']
+        f.seek(start)
+        # Rows are streamed, so a rebuild never holds the log in memory
+        reader = csv.reader(_complete_lines(f, size, index))
+        if index['header'] is None:
+            header = next(reader, None)
+            if header is None:
+                return index  # the header is still being written
+            index['header'] = header
+            index['outdated_format'] = not {'Project', 'Task', 'Duration'}.issubset(header)
+
+        if index['outdated_format']:
+            for _ in reader:
+                pass
+        else:
+            consume(index, reader)
+        if index['offset'] == start:
+            return index
+        index['fingerprint'] = _log_fingerprint(f, index['offset'])
+        index['mtime'] = stat.st_mtime_ns
+
+    if save:
+        _save_log_index(index, sidecar_file)
+    return index
+
+def _complete_lines(f, end, index):
+    """Yield the decoded lines of binary file `f` from its position, advancing index['offset'].
+
+    Stops at the first line starting at or past `end` and at a half-written
+    last line, which a later call picks up.
+    """
+    for line in f:
+        if index['offset'] >= end or not line.endswith(b'\n'):
+            break
+        index['offset'] += len(line)
+        yield line.decode('utf-8')
+
+def _add_index_rows(index, reader):
+    header = index['header']
+    project_col = header.index('Project')
+    task_col = header.index('Task')
+    duration_col = header.index('Duration')
+    seconds_col = header.index('Duration Seconds') if 'Duration Seconds' in header else None
+    width = max(project_col, task_col, duration_col)
+    totals = index['totals']
+    parse = _csv_session_parser(header)
+    runs = index['runs']
+    position = index['offset']  # where the next row starts; reading a row advances the offset
+    for row in reader:
+        row_start, position = position, index['offset']
+        if len(row) <= width:
+            continue
+        if seconds_col is not None and len(row) > seconds_col and row[seconds_col]:
+            seconds = int(row[seconds_col])
         else:
-            days = 0
-            time_str = duration_str
+            seconds = parse_duration_seconds(row[duration_col])
+        tasks = totals.setdefault(row[project_col], {})
+        tasks[row[task_col]] = tasks.get(row[task_col], 0) + seconds
+        session = parse(row)
+        if session is not None:
+            _track_runs(runs, row_start, session[2])
+
+def _track_runs(runs, position, start):
+    """Fold a row at `position` (byte offset or record number) starting at `start` into `runs`.
+
+    A run is [position of its first row, earliest start, latest start,
+    ordered]: a stretch of the log in which no row starts more than
+    ORDER_SLACK before an earlier row, so a date window can bisect it. A row
+    further out of order (a segment that ran for days, a backfilled import)
+    begins a new run. Past MAX_RUNS runs the last one takes every later row
+    and, once it is out of order, is read in full.
+    """
+    if runs:
+        run = runs[-1]
+        in_order = start >= run[2] - ORDER_SLACK
+        if in_order or len(runs) >= MAX_RUNS:
+            run[1], run[2] = min(run[1], start), max(run[2], start)
+            run[3] = run[3] and in_order
+            return
+    runs.append([position, start, start, True])
+
+def _run_ranges(runs, first, end, since, until):
+    """Return [(start, end, ordered)] position ranges of the runs a [since, until) window can touch.
+
+    The first range starts at `first` and the last one ends at `end`, so rows
+    appended since `runs` was brought up to date are read with the last run.
+    """
+    if not runs:
+        return [(first, end, True)]
+    ranges = []
+    for i, (position, min_start, max_start, ordered) in enumerate(runs):
+        last = i == len(runs) - 1
+        if not last and (since is not None and max_start < since or until is not None and min_start >= until):
+            continue
+        ranges.append((first if i == 0 else position, end if last else runs[i + 1][0], ordered))
+    return ranges
+
+def _track_order(start, max_start, disorder):
+    """Fold one start time into (latest start so far, largest backwards jump) and return them."""
+    if max_start is None or start > max_start:
+        return start, disorder
+    return max_start, max(disorder, max_start - start)
+
+def update_log_index(log_file=None, save=True):
+    """Bring the sidecar index up to date with the log and return it.
+
+    The index keeps per-(project, task) totals in seconds, read incrementally
+    as described in _update_sidecar, and the log's 'runs' (see _track_runs),
+    which say where date windows can bisect it. Returns None when there is no log file. `log_file` defaults to
+    LOG_FILE; `save` is passed on to _update_sidecar.
+    """
+    log_file = log_file or LOG_FILE
+    return _update_sidecar(log_file, _index_path(log_file),
+                           {'totals': {}, 'runs': []}, _add_index_rows, save)
+
+def _rollup_path(log_file):
+    """The daily rollup of a CSV log: productivity_log.csv -> productivity_log.rollup."""
+    return os.path.splitext(log_file)[0] + '.rollup'
+
+def _add_rollup_rows(rollup, reader):
+    parse = _csv_session_parser(rollup['header'])
+    days = rollup['days']
+    for row in reader:
+        session = parse(row)
+        if session is None:
+            continue
+        project, task, start, seconds = session
+        task_days = days.setdefault(project, {}).setdefault(task, {})
+        for day, part in split_into_bins(start, seconds, DAY):
+            task_days[str(day)] = task_days.get(str(day), 0) + part
+
+def update_log_rollup(log_file=None):
+    """Bring the daily rollup sidecar up to date with the log and return it.
+
+    The rollup keeps seconds per epoch day (sessions split at midnight) for
+    every (project, task) under 'days', kept like the index. It lives in a
+    file of its own so totals lookups never load it.
+    """
+    log_file = log_file or LOG_FILE
+    return _update_sidecar(log_file, _rollup_path(log_file), {'days': {}}, _add_rollup_rows)
+
+def _archive_dir(log_file):
+    """The archive of a CSV log: productivity_log.csv -> productivity_log.archive/."""
+    return os.path.splitext(log_file)[0] + '.archive'
+
+def _archive_summaries(log_file):
+    """Return the summaries of a log's archived segments, oldest first.
+
+    Each summary is a small JSON file next to its compressed segment with the
+    segment's header, row count, start-time range and last end, and per
+    (project, task) its totals, session counts and weekday-by-hour bins; the
+    segment's daily rollup sits in a .rollup file beside them. Totals,
+    rollups and unwindowed reports never decompress anything.
+    """
+    archive_dir = _archive_dir(log_file)
+    if not os.path.isdir(archive_dir):
+        return []
+    summaries = []
+    for name in sorted(os.listdir(archive_dir)):
+        if name.endswith('.json'):
+            summary = _load_log_index(os.path.join(archive_dir, name))
+            if summary is not None:
+                summary['path'] = os.path.join(archive_dir, summary['file'])
+                summaries.append(summary)
+    return summaries
+
+def _archive_segments(log_file, project=None, task=None, since=None, until=None):
+    """The summaries of the archived segments a query could find sessions in."""
+    segments = []
+    for summary in _archive_summaries(log_file):
+        if since is not None and summary['last_start'] < since:
+            continue
+        if until is not None and summary['first_start'] >= until:
+            continue
+        if project and (project not in summary['totals']
+                        or task and task not in summary['totals'][project]):
+            continue
+        segments.append(summary)
+    return segments
+
+def _open_archive(path):
+    """Open a compressed segment for streaming text reads."""
+    if path.endswith('.xz'):
+        import lzma
+        return lzma.open(path, 'rt', encoding='utf-8', newline='')
+    import gzip
+    return gzip.open(path, 'rt', encoding='utf-8', newline='')
+
+def _segment_ordered(summary):
+    """True if an archived segment's rows are in start order give or take ORDER_SLACK."""
+    return summary.get('disorder', ORDER_SLACK + 1) <= ORDER_SLACK
+
+def _iter_segment_sessions(summary, project=None, task=None, since=None, until=None):
+    """Yield the matching sessions of one archived segment, decompressing it as it is read."""
+    with _open_archive(summary['path']) as f:
+        reader = csv.reader(f)
+        parse = _csv_session_parser(next(reader, []))
+        yield from _filter_sessions(reader, parse, project, task, since, until, _segment_ordered(summary))
+
+def iter_archived_sessions(log_file, project=None, task=None, since=None, until=None):
+    """Yield the matching sessions of a log's archived segments, like CSVStorage.iter_sessions."""
+    for summary in _archive_segments(log_file, project, task, since, until):
+        yield from _iter_segment_sessions(summary, project, task, since, until)
+
+def add_archived_sessions(data, log_file):
+    """Add a log's archived sessions to an unwindowed ReportData.
+
+    A segment that ended before the recent-days window is added from the
+    bins in its summary; only the others are decompressed.
+    """
+    for summary in _archive_segments(log_file, data.project_name, data.task_name):
+        if 'heatmap' in summary and summary['last_end'] <= data.window_start:
+            data.add_summary(summary)
+        else:
+            for session in _iter_segment_sessions(summary, data.project_name, data.task_name):
+                data.add_session(*session)
+
+def _merge_nested(target, source):
+    """Add the numbers of a nested {key: ... {key: number}} dict into `target`."""
+    for key, value in source.items():
+        if isinstance(value, dict):
+            _merge_nested(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+    return target
 
-        # Handle microseconds by splitting at the dot
-        if '.' in time_str:
-            time_str = time_str.split('.')[0]
+class LogFormatError(Exception):
+    """The log exists but is missing columns the reader needs."""
 
-        parts = list(map(int, time_str.split(':')))
-        return timedelta(days=days, hours=parts[0], minutes=parts[1], seconds=parts[2])
-    except (ValueError, IndexError):
-        return timedelta()
 
-def get_historical_time(project, task):
-    if not os.path.isfile(LOG_FILE):
-        return "0:00:00"
-    total_duration = timedelta()
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
+def to_epoch(dt):
+    """Seconds since 1970-01-01 on the local wall clock.
+
+    The log stores naive local times, so this is a wall-clock count rather
+    than a UTC timestamp: hour and date fall out of plain integer division.
+    """
+    return (dt.toordinal() - EPOCH_ORDINAL) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+def from_epoch(seconds):
+    return EPOCH + timedelta(seconds=seconds)
+
+def _csv_session_parser(header):
+    """Return a function turning a csv.reader row into a session tuple, or None.
+
+    Rows that carry the Start Epoch / Duration Seconds columns are read as
+    integers. Legacy rows fall back to parsing Date, Start Time and Duration
+    by hand, with the date lookups memoized since many rows share a date; a
+    row whose Start Time is unreadable starts at midnight of its Date rather
+    than being dropped.
+    """
+    columns = {name: i for i, name in enumerate(header)}
+    project_col, task_col, duration_col = columns['Project'], columns['Task'], columns['Duration']
+    date_col, time_col = columns.get('Date'), columns.get('Start Time')
+    epoch_col, seconds_col = columns.get('Start Epoch'), columns.get('Duration Seconds')
+    date_epochs = {}
+
+    def parse(row):
         try:
+            if epoch_col is not None and row[epoch_col] and row[seconds_col]:
+                return row[project_col], row[task_col], int(row[epoch_col]), int(row[seconds_col])
+            if not row[duration_col]:
+                return None
+            date_str = row[date_col]
+            day_start = date_epochs.get(date_str)
+            if day_start is None:
+                day_start = date_epochs[date_str] = to_epoch(datetime.strptime(date_str, '%Y-%m-%d'))
+            try:
+                hours, minutes, seconds = row[time_col].split(':')
+                start = day_start + int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+            except (IndexError, TypeError, ValueError):
+                start = day_start
+            return row[project_col], row[task_col], start, parse_duration_seconds(row[duration_col])
+        except (IndexError, TypeError, ValueError):
+            return None
+
+    return parse
+
+
+def _filter_sessions(rows, parse, project=None, task=None, since=None, until=None, ordered=True):
+    """Yield the sessions in csv `rows` matching the filter and start-time window.
+
+    If the rows are `ordered` (in start order give or take ORDER_SLACK),
+    stops at the first row starting ORDER_SLACK past `until` and returns
+    True (the generator's return value); otherwise every row is read.
+    """
+    stop = None if until is None or not ordered else until + ORDER_SLACK
+    for row in rows:
+        session = parse(row)
+        if session is None:
+            continue
+        if stop is not None and session[2] >= stop:
+            return True
+        if project and session[0] != project:
+            continue
+        if task and session[1] != task:
+            continue
+        if since is not None and session[2] < since:
+            continue
+        if until is not None and session[2] >= until:
+            continue
+        yield session
+    return False
+
+
+def _iter_lines(raw, start, end):
+    """Yield the decoded lines of binary file `raw` that start in [start, end)."""
+    raw.seek(start)
+    position = start
+    for line in raw:
+        if position >= end:
+            break
+        position += len(line)
+        yield line.decode('utf-8')
+
+
+def _is_current_log(f, path):
+    """True if the open file `f` is still the file at `path`."""
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(f.fileno())
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+class CSVStorage:
+    """A flat CSV log (productivity_log.csv by default); totals are served from its sidecar index."""
+
+    name = 'csv'
+
+    def __init__(self, path=None, archived=True, save_sidecars=True):
+        self.path = path or LOG_FILE
+        self.archived = archived  # whether session reads include the archived segments
+        self.save_sidecars = save_sidecars  # False for other users' logs: the index is kept in memory
+        self._header_cache = None  # ((st_dev, st_ino), fieldnames) of the last validated log
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def append(self, project, task, start_time, end_time):
+        self.append_many([(project, task, start_time, end_time)])
+
+    def append_many(self, sessions):
+        """Append (project, task, start datetime, end datetime) sessions in one locked write."""
+        # Rows in LOG_FIELDNAMES order. strftime is slow enough to dominate
+        # large batches, so dates are formatted once per day and times by hand.
+        rows = []
+        dates = {}
+        for project, task, start_time, end_time in sessions:
+            duration = end_time - start_time
+            day = start_time.toordinal()
+            date_str = dates.get(day)
+            if date_str is None:
+                date_str = dates[day] = start_time.strftime('%Y-%m-%d')
+            rows.append((
+                date_str, project, task,
+                f"{start_time.hour:02d}:{start_time.minute:02d}:{start_time.second:02d}",
+                f"{end_time.hour:02d}:{end_time.minute:02d}:{end_time.second:02d}",
+                str(duration),
+                (day - EPOCH_ORDINAL) * 86400 + start_time.hour * 3600 + start_time.minute * 60 + start_time.second,
+                int(duration.total_seconds()),
+            ))
+
+        while True:
+            with open(self.path, 'a+', newline='') as f:
+                # Concurrent timers take turns, so rows never interleave
+                fcntl.flock(f, fcntl.LOCK_EX)
+                if not _is_current_log(f, self.path):
+                    continue  # the log was replaced while we waited for the lock
+                fieldnames = self._fieldnames(f)
+                if fieldnames is None:
+                    self._migrate_header(f)
+                    continue
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                if fieldnames is LOG_FIELDNAMES:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        writer.writerow(LOG_FIELDNAMES)
+                    writer.writerows(rows)
+                else:
+                    # Legacy or extended header: pick its columns, blank the ones we don't write
+                    columns = [LOG_FIELDNAMES.index(name) if name in LOG_FIELDNAMES else None
+                               for name in fieldnames]
+                    writer.writerows(['' if i is None else row[i] for i in columns] for row in rows)
+                f.write(buffer.getvalue())
+                return
+
+    def _fieldnames(self, f):
+        """Return the columns to append with, or None if the header needs migrating.
+
+        The header is read once per log file (identified by device and inode)
+        and cached, so appends never rescan the log.
+        """
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            return LOG_FIELDNAMES
+        key = (stat.st_dev, stat.st_ino)
+        if self._header_cache is not None and self._header_cache[0] == key:
+            return self._header_cache[1]
+
+        f.seek(0)
+        header = next(csv.reader([f.readline()]), [])
+        if header == LEGACY_LOG_FIELDNAMES:
+            # Keep appending legacy rows; readers parse the text columns
+            fieldnames = LEGACY_LOG_FIELDNAMES
+        elif header == LOG_FIELDNAMES:
+            fieldnames = LOG_FIELDNAMES
+        elif set(LOG_FIELDNAMES).issubset(header):
+            fieldnames = header
+        else:
+            return None
+        self._header_cache = (key, fieldnames)
+        return fieldnames
+
+    def _migrate_header(self, f):
+        """Rewrite the log under a header with every current column, one row at a time.
+
+        Columns the current format doesn't know are kept after the standard
+        ones, and the integer columns are filled in where they can be parsed.
+        The rewritten file replaces the log atomically while `f` holds the lock.
+        """
+        f.seek(0)
+        reader = csv.reader(f)
+        header = next(reader, [])
+        fieldnames = LOG_FIELDNAMES + [name for name in header if name and name not in LOG_FIELDNAMES]
+        parse = None
+        if {'Project', 'Task', 'Duration'}.issubset(header):
+            parse = _csv_session_parser(header)
+
+        tmp_file = self.path + '.migrating'
+        with open(tmp_file, 'w', newline='') as out:
+            writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
             for row in reader:
-                if row['Project'] == project and row['Task'] == task:
-                    total_duration += parse_duration(row['Duration'])
-        except KeyError:
-            console.print(f"[bold red]Warning:[/bold red] The log file '{LOG_FILE}' has an outdated format. Please delete it to start a new log.")
-            return "0:00:00"
-    return str(total_duration)
+                entry = dict(zip(header, row))
+                session = parse(row) if parse is not None else None
+                if session is not None and not entry.get('Start Epoch'):
+                    entry['Start Epoch'], entry['Duration Seconds'] = session[2], session[3]
+                writer.writerow(entry)
+        os.replace(tmp_file, self.path)
+
+    def totals(self):
+        """Return {project: {task: seconds}} for the whole log, archived segments included."""
+        index = update_log_index(self.path)
+        if index is None:
+            return {}
+        if index['outdated_format']:
+            raise LogFormatError(self.path)
+        summaries = _archive_summaries(self.path)
+        if not summaries:
+            return index['totals']
+        totals = _merge_nested({}, index['totals'])
+        for summary in summaries:
+            _merge_nested(totals, summary['totals'])
+        return totals
+
+    def task_total(self, project, task):
+        return self.totals().get(project, {}).get(task, 0)
+
+    def daily_totals(self):
+        """Return {project: {task: {epoch day: seconds}}} from the log's rollup sidecar."""
+        rollup = update_log_rollup(self.path)
+        if rollup is None:
+            return {}
+        if rollup['outdated_format']:
+            raise LogFormatError(self.path)
+        summaries = _archive_summaries(self.path)
+        if not summaries:
+            return rollup['days']
+        days = _merge_nested({}, rollup['days'])
+        for summary in summaries:
+            _merge_nested(days, _load_log_index(os.path.join(os.path.dirname(summary['path']),
+                                                             summary['rollup']))['days'])
+        return days
+
+    def iter_sessions(self, project=None, task=None, since=None, until=None):
+        """Yield (project, task, start epoch, duration seconds) in log order.
+
+        `since` and `until` bound the session start time (epoch seconds,
+        until exclusive) when given. Rows are appended in roughly
+        chronological order, so the first row of the window is found by
+        binary search over byte offsets and reading stops once rows are
+        past the window; ORDER_SLACK absorbs rows logged out of order. Rows
+        further out of order than that (a segment that ran for days, a
+        backfilled import) start a new run in the index, and each run the
+        window can touch is searched the same way (see _ranges). Archived
+        segments come first, decompressed as they are read, and only those
+        whose summary says they can hold matching sessions.
+        """
+        if not os.path.isfile(self.path):
+            return
+        if self.archived:
+            yield from iter_archived_sessions(self.path, project, task, since, until)
+        with open(self.path, 'rb') as raw:
+            header, offset = self._read_header(raw)
+            parse = _csv_session_parser(header)
+            if profiler is not None:
+                parse = profiler.timed('load: parse fields (in read sessions)', parse)
+            for start, end, ordered in self._ranges(raw, parse, offset, since, until):
+                if end is None:
+                    # The last range runs to the end of the file, which a TextIOWrapper reads fastest
+                    raw.seek(start)
+                    reader = csv.reader(io.TextIOWrapper(raw, encoding='utf-8', newline=''))
+                else:
+                    reader = csv.reader(_iter_lines(raw, start, end))
+                yield from _filter_sessions(reader, parse, project, task, since, until, ordered)
+
+    def _ranges(self, raw, parse, first, since, until):
+        """Return the (start, end, ordered) byte ranges a [since, until) window must read.
+
+        Without a window that is every row from `first` on. Otherwise the
+        index's runs that can hold the window are read, each from its first
+        row starting at or after since - ORDER_SLACK if it is ordered. An end
+        of None means the end of the file.
+        """
+        if since is None and until is None:
+            return [(first, None, True)]
+        index = update_log_index(self.path, self.save_sidecars)
+        if index is None or index['outdated_format']:
+            return [(first, None, False)]
+        ranges = []
+        for start, end, ordered in _run_ranges(index['runs'], first, None, since, until):
+            if since is not None and ordered:
+                start = self._find_offset(raw, parse, start, since - ORDER_SLACK, end)
+            ranges.append((start, end, ordered))
+        return ranges
+
+    def chunks(self, jobs, since=None, until=None):
+        """Split the rows into up to `jobs` (path, header, start, end, ordered, run) byte ranges.
+
+        Ranges begin on line boundaries and are read with _iter_lines. They
+        cover the same rows iter_sessions would read (see _ranges), so a
+        worker per range sees the same rows as one serial pass; `ordered`
+        says whether a worker may stop early, and `run` is where the range's
+        run starts: a stop ends that run only. Each archived segment
+        iter_sessions would read is one more chunk, with an end of None:
+        compressed streams can't be split.
+        """
+        if not os.path.isfile(self.path):
+            return []
+        chunks = [(summary['path'], summary['header'], 0, None, _segment_ordered(summary), 0)
+                  for summary in _archive_segments(self.path, since=since, until=until) if self.archived]
+        with open(self.path, 'rb') as raw:
+            header, first = self._read_header(raw)
+            size = os.fstat(raw.fileno()).st_size
+            ranges = [(start, size if end is None else end, ordered)
+                      for start, end, ordered in self._ranges(raw, _csv_session_parser(header), first, since, until)]
+            total = sum(end - start for start, end, _ in ranges)
+            for start, end, ordered in ranges:
+                # Each range gets its share of the jobs, by size
+                parts = max(1, jobs * (end - start) // total) if total else 1
+                bounds = [start]
+                for i in range(1, parts):
+                    target = start + (end - start) * i // parts
+                    if target <= bounds[-1]:
+                        continue
+                    raw.seek(target - 1)
+                    raw.readline()  # move to the first line starting at or after target
+                    if raw.tell() < end:
+                        bounds.append(raw.tell())
+                bounds.append(end)
+                chunks += [(self.path, header, lo, hi, ordered, start)
+                           for lo, hi in zip(bounds, bounds[1:]) if lo < hi]
+        return chunks
+
+    def _read_header(self, raw):
+        """Return (header, offset of the first row) for the log open in binary mode."""
+        raw.seek(0)
+        header_line = raw.readline()
+        header = next(csv.reader([header_line.decode('utf-8')]), [])
+        if not {'Project', 'Task', 'Duration'}.issubset(header):
+            raise LogFormatError(self.path)
+        return header, len(header_line)
+
+    @staticmethod
+    def _find_offset(raw, parse, lo, target, hi=None):
+        """Byte offset of the first row in [lo, hi) starting at or after `target` (epoch seconds).
+
+        Each probe seeks to the middle of the remaining range and resyncs to
+        the next line boundary; unparseable rows count as earlier than target.
+        `hi` defaults to the end of the file.
+        """
+        if hi is None:
+            hi = os.fstat(raw.fileno()).st_size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            raw.seek(mid - 1)
+            raw.readline()  # skip to the first line starting at or after mid
+            line_start = raw.tell()
+            if line_start >= hi:
+                hi = mid
+                continue
+            row = next(csv.reader([raw.readline().decode('utf-8', 'replace')]), [])
+            session = parse(row)
+            if session is None or session[2] < target:
+                lo = raw.tell()
+            else:
+                hi = line_start
+        return lo
+
+
+class SQLiteStorage:
+    """A stdlib sqlite3 database indexed on (project, task) and date."""
+
+    name = 'sqlite'
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            project TEXT NOT NULL,
+            task TEXT NOT NULL,
+            start INTEGER NOT NULL,
+            duration INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS sessions_project_task ON sessions (project, task);
+        CREATE INDEX IF NOT EXISTS sessions_date ON sessions (date);
+        CREATE INDEX IF NOT EXISTS sessions_start ON sessions (start);
+        CREATE TABLE IF NOT EXISTS daily (
+            project TEXT NOT NULL,
+            task TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            seconds INTEGER NOT NULL,
+            PRIMARY KEY (project, task, day)
+        ) WITHOUT ROWID;
+    """
+    SCHEMA_VERSION = 1  # PRAGMA user_version once the daily table is filled in
+
+    def __init__(self):
+        self._conn = None
+
+    @property
+    def path(self):
+        return DB_FILE
+
+    def exists(self):
+        return os.path.isfile(DB_FILE)
+
+    def connect(self):
+        if self._conn is None:
+            import sqlite3
+            self._conn = sqlite3.connect(DB_FILE)
+            self._conn.executescript(self.SCHEMA)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < self.SCHEMA_VERSION:
+                # A database from before the daily table: roll up what it holds
+                with self._conn:
+                    self._conn.execute("DELETE FROM daily")
+                    self._add_daily(self._conn.execute("SELECT project, task, start, duration FROM sessions"))
+                    self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        return self._conn
+
+    def _add_daily(self, sessions, days=None):
+        """Add (project, task, start epoch, seconds) sessions to the daily table, split at midnight.
+
+        `days` may carry {(project, task, day): seconds} already summed.
+        """
+        days = defaultdict(int) if days is None else days
+        for project, task, start, duration in sessions:
+            for day, part in split_into_bins(start, duration, DAY):
+                days[project, task, day] += part
+        self._conn.executemany(
+            "INSERT INTO daily (project, task, day, seconds) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (project, task, day) DO UPDATE SET seconds = seconds + excluded.seconds",
+            ((project, task, day, seconds) for (project, task, day), seconds in days.items()))
+
+    def append(self, project, task, start_time, end_time):
+        self.append_many([(project, task, start_time, end_time)])
+
+    def append_many(self, sessions):
+        """Insert (project, task, start datetime, end datetime) sessions in one transaction."""
+        conn = self.connect()
+        rows = [
+            (start_time.strftime('%Y-%m-%d'), project, task, to_epoch(start_time),
+             int((end_time - start_time).total_seconds()))
+            for project, task, start_time, end_time in sessions
+        ]
+        with conn:
+            conn.executemany(
+                "INSERT INTO sessions (date, project, task, start, duration) VALUES (?, ?, ?, ?, ?)", rows)
+            self._add_daily(row[1:] for row in rows)
+
+    def bulk_load(self, sessions):
+        """Replace the table's contents with `sessions` in one transaction."""
+        _forget_import_keys(self)
+        conn = self.connect()
+        days = defaultdict(int)  # the daily table's rows, summed while the sessions stream in
+
+        def rows():
+            for project, task, start, duration in sessions:
+                for day, part in split_into_bins(start, duration, DAY):
+                    days[project, task, day] += part
+                yield date.fromordinal(start // 86400 + EPOCH_ORDINAL).isoformat(), project, task, start, duration
+
+        with conn:
+            conn.execute("DELETE FROM sessions")
+            conn.execute("DELETE FROM daily")
+            conn.executemany(
+                "INSERT INTO sessions (date, project, task, start, duration) VALUES (?, ?, ?, ?, ?)", rows())
+            self._add_daily((), days)
+        return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def totals(self):
+        if not self.exists():
+            return {}
+        totals = {}
+        query = "SELECT project, task, SUM(duration) FROM sessions GROUP BY project, task"
+        for project, task, seconds in self.connect().execute(query):
+            totals.setdefault(project, {})[task] = seconds
+        return totals
+
+    def task_total(self, project, task):
+        if not self.exists():
+            return 0
+        query = "SELECT COALESCE(SUM(duration), 0) FROM sessions WHERE project = ? AND task = ?"
+        return self.connect().execute(query, (project, task)).fetchone()[0]
+
+    def daily_totals(self):
+        """Return {project: {task: {epoch day: seconds}}} from the daily table."""
+        if not self.exists():
+            return {}
+        days = {}
+        for project, task, day, seconds in self.connect().execute("SELECT project, task, day, seconds FROM daily"):
+            days.setdefault(project, {}).setdefault(task, {})[day] = seconds
+        return days
+
+    def iter_sessions(self, project=None, task=None, since=None, until=None):
+        if not self.exists():
+            return
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("start >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("start < ?")
+            params.append(until)
+        if project:
+            clauses.append("project = ?")
+            params.append(project)
+        if task:
+            clauses.append("task = ?")
+            params.append(task)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        yield from self.connect().execute(
+            f"SELECT project, task, start, duration FROM sessions{where} ORDER BY start", params)
+
+
+class BinaryStorage:
+    """A fixed-width binary log read through mmap.
+
+    After an 8-byte magic header, each record is a little-endian int64 start
+    epoch, int32 duration seconds, int32 project id and int32 task id. The ids
+    index into the name lists kept in NAMES_FILE, so reads never parse text;
+    appends also keep the log's runs of start order there (see _track_runs).
+    """
+
+    name = 'binary'
+
+    MAGIC = b'PTLOGv1\n'
+    RECORD = struct.Struct('<qiii')
+    NUMPY_DTYPE = [('start', '<i8'), ('duration', '<i4'), ('project', '<i4'), ('task', '<i4')]
+
+    def __init__(self):
+        self._names = None
+
+    @property
+    def path(self):
+        return BIN_FILE
+
+    def exists(self):
+        return os.path.isfile(BIN_FILE)
+
+    def _load_names(self):
+        if self._names is None:
+            try:
+                with open(NAMES_FILE, 'r') as f:
+                    self._names = json.load(f)
+            except (OSError, ValueError):
+                self._names = {'projects': [], 'tasks': []}
+        return self._names
+
+    def _save_names(self):
+        tmp_file = NAMES_FILE + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump(self._names, f)
+        os.replace(tmp_file, NAMES_FILE)
+
+    def _intern(self, kind, name, lookup):
+        """Return the id for `name`, adding it to the dictionary if it is new."""
+        if name not in lookup:
+            lookup[name] = len(self._names[kind])
+            self._names[kind].append(name)
+        return lookup[name]
+
+    def append(self, project, task, start_time, end_time):
+        self.append_many([(project, task, start_time, end_time)])
+
+    def append_many(self, sessions):
+        """Append (project, task, start datetime, end datetime) sessions under one lock."""
+        with open(BIN_FILE, 'ab') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            # Another writer may have added names since we last looked
+            self._names = None
+            names = self._load_names()
+            lookups = ({p: i for i, p in enumerate(names['projects'])},
+                       {t: i for i, t in enumerate(names['tasks'])})
+            position = max(0, os.fstat(f.fileno()).st_size - len(self.MAGIC)) // self.RECORD.size
+            if 'runs' not in names:
+                # A log from before runs were tracked
+                names.pop('max_start', None)
+                names.pop('disorder', None)
+                names['runs'] = self._scan_runs() if position else []
+                self._save_names()
+            runs = names['runs']
+            known = len(names['projects']), len(names['tasks']), [run[:] for run in runs]
+            records = []
+            for project, task, start_time, end_time in sessions:
+                start = to_epoch(start_time)
+                _track_runs(runs, position, start)
+                position += 1
+                records.append(self.RECORD.pack(start, int((end_time - start_time).total_seconds()),
+                                                self._intern('projects', project, lookups[0]),
+                                                self._intern('tasks', task, lookups[1])))
+            # Names go to disk before the records that refer to them
+            if (len(names['projects']), len(names['tasks']), runs) != known:
+                self._save_names()
+            # In append mode tell() is where the file ended when it was opened,
+            # not after a writer that held the lock before us
+            if os.fstat(f.fileno()).st_size == 0:
+                f.write(self.MAGIC)
+            f.write(b''.join(records))
+
+    def bulk_load(self, sessions):
+        """Replace the log with `sessions`, writing records in large buffered chunks."""
+        _forget_import_keys(self)
+        self._names = {'projects': [], 'tasks': []}
+        lookups = ({}, {})
+        pack = self.RECORD.pack
+        count = 0
+        runs = self._names['runs'] = []
+        tmp_file = BIN_FILE + '.tmp'
+        with open(tmp_file, 'wb', buffering=1 << 20) as f:
+            f.write(self.MAGIC)
+            for project, task, start, duration in sessions:
+                f.write(pack(start, duration, self._intern('projects', project, lookups[0]),
+                             self._intern('tasks', task, lookups[1])))
+                _track_runs(runs, count, start)
+                count += 1
+        self._save_names()
+        os.replace(tmp_file, BIN_FILE)
+        return count
+
+    @contextlib.contextmanager
+    def _mapped(self):
+        """Map the log and yield (view, count) over the record bytes.
+
+        Anything still referring to the view (slices, NumPy arrays, struct
+        iterators) must be gone when the block exits, or the mapping can't close.
+        """
+        with open(BIN_FILE, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size <= len(self.MAGIC):
+                yield memoryview(b''), 0
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[:len(self.MAGIC)] != self.MAGIC:
+                    raise LogFormatError(BIN_FILE)
+                # A torn trailing record from an interrupted append is ignored
+                count = (size - len(self.MAGIC)) // self.RECORD.size
+                view = memoryview(mm)[len(self.MAGIC):len(self.MAGIC) + count * self.RECORD.size]
+                try:
+                    yield view, count
+                finally:
+                    view.release()
+
+    def _scan(self, consume):
+        """Map the log and return `consume(view, count)` on the record bytes."""
+        with self._mapped() as (view, count):
+            return consume(view, count)
+
+    def totals(self):
+        if not self.exists():
+            return {}
+        projects, tasks = self._load_names()['projects'], self._load_names()['tasks']
+
+        def consume(view, count):
+            sums = defaultdict(int)
+            if count and _numpy() is not None:
+                records = np.frombuffer(view, dtype=self.NUMPY_DTYPE, count=count)
+                keys = records['project'].astype(np.int64) * len(tasks) + records['task']
+                seen = np.bincount(keys)
+                weights = np.bincount(keys, weights=records['duration'])
+                del records
+                for key in np.flatnonzero(seen):
+                    sums[divmod(int(key), len(tasks))] = int(weights[key])
+            else:
+                for _, duration, project_id, task_id in self.RECORD.iter_unpack(view):
+                    sums[project_id, task_id] += duration
+            return sums
+
+        totals = {}
+        for (project_id, task_id), seconds in self._scan(consume).items():
+            totals.setdefault(projects[project_id], {})[tasks[task_id]] = seconds
+        return totals
+
+    def task_total(self, project, task):
+        return self.totals().get(project, {}).get(task, 0)
+
+    def daily_totals(self):
+        """Return {project: {task: {epoch day: seconds}}}, sessions split at midnight.
+
+        The rollup is kept in BIN_ROLLUP_FILE with the number of records it
+        covers, so a call only folds in the records appended since the last
+        one; a log that was replaced (another device and inode) or shrank is
+        rolled up again from the start.
+        """
+        if not self.exists():
+            return {}
+        stat = os.stat(BIN_FILE)
+        identity = [stat.st_dev, stat.st_ino]
+        rollup = _load_log_index(BIN_ROLLUP_FILE, SIDECAR_VERSION)
+        with self._mapped() as (view, count):
+            if rollup is None or rollup['identity'] != identity or rollup['count'] > count:
+                rollup = {'version': SIDECAR_VERSION, 'identity': identity, 'count': 0, 'days': {}}
+            if rollup['count'] == count:
+                return rollup['days']
+            # Names are written before the records using them, so these cover the mapping
+            self._names = None
+            names = self._load_names()
+            projects, tasks = names['projects'], names['tasks']
+            new = view[rollup['count'] * self.RECORD.size:]
+            try:
+                sums = self._daily_sums(new, count - rollup['count'], len(tasks))
+            finally:
+                new.release()
+        for (project_id, task_id, day), seconds in sums.items():
+            task_days = rollup['days'].setdefault(projects[project_id], {}).setdefault(tasks[task_id], {})
+            task_days[str(day)] = task_days.get(str(day), 0) + seconds
+        rollup['count'] = count
+        _save_log_index(rollup, BIN_ROLLUP_FILE)
+        return rollup['days']
+
+    def _daily_sums(self, view, count, task_count):
+        """Return {(project id, task id, epoch day): seconds} over `count` records in `view`.
+
+        With NumPy, sessions within one day are summed without a Python-level
+        loop; the few that cross midnight are split one by one.
+        """
+        sums = defaultdict(int)
+        if count and _numpy() is not None:
+            records = np.frombuffer(view, dtype=self.NUMPY_DTYPE, count=count)
+            starts = records['start'].astype(np.int64)
+            durations = records['duration'].astype(np.int64)
+            pairs = records['project'].astype(np.int64) * task_count + records['task']
+            del records
+            days = starts // DAY
+            spans = (starts + durations - 1) // DAY > days
+            single = (durations > 0) & ~spans
+            if single.any():
+                first_day = days[single].min()
+                width = int(days[single].max() - first_day) + 1
+                keys, inverse = np.unique(pairs[single] * width + (days[single] - first_day),
+                                          return_inverse=True)
+                seconds = np.bincount(inverse, weights=durations[single])
+                for key, total in zip(keys.tolist(), seconds.tolist()):
+                    pair, day = divmod(key, width)
+                    sums[(*divmod(pair, task_count), day + int(first_day))] += int(total)
+            for pair, start, duration in zip(pairs[spans].tolist(), starts[spans].tolist(),
+                                             durations[spans].tolist()):
+                for day, part in split_into_bins(start, duration, DAY):
+                    sums[(*divmod(pair, task_count), day)] += part
+        else:
+            for start, duration, project_id, task_id in self.RECORD.iter_unpack(view):
+                for day, part in split_into_bins(start, duration, DAY):
+                    sums[project_id, task_id, day] += part
+        return sums
+
+    def _scan_runs(self):
+        """Work out the runs (see _track_runs) of a log written before NAMES_FILE kept them."""
+        def consume(view, count):
+            runs = []
+            for position, (start, _, _, _) in enumerate(self.RECORD.iter_unpack(view)):
+                _track_runs(runs, position, start)
+            return runs
+
+        return self._scan(consume)
+
+    def _bisect(self, view, lo, hi, target):
+        """Index of the first record in [lo, hi) whose start is at or after `target`."""
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.RECORD.unpack_from(view, mid * self.RECORD.size)[0] < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def session_columns(self, project=None, task=None):
+        """Return NumPy (starts, durations) columns for the matching sessions."""
+        if not self.exists():
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        names = self._load_names()
+        project_id = names['projects'].index(project) if project in names['projects'] else -1
+        task_id = names['tasks'].index(task) if task in names['tasks'] else -1
+
+        def consume(view, count):
+            records = np.frombuffer(view, dtype=self.NUMPY_DTYPE, count=count)
+            mask = np.ones(count, dtype=bool)
+            if project:
+                mask &= records['project'] == project_id
+            if task:
+                mask &= records['task'] == task_id
+            # Boolean indexing copies, so the columns outlive the mapping
+            columns = records['start'][mask], records['duration'][mask].astype(np.int64)
+            del records
+            return columns
+
+        return self._scan(consume)
+
+    def iter_sessions(self, project=None, task=None, since=None, until=None):
+        if not self.exists():
+            return
+        names = self._load_names()
+        projects, tasks = names['projects'], names['tasks']
+        project_id = projects.index(project) if project in projects else None
+        task_id = tasks.index(task) if task in tasks else None
+        if (project and project_id is None) or (task and task_id is None):
+            return
 
-def log_session(project, task, start_time, end_time):
-    duration = end_time - start_time
-    if duration.total_seconds() < 1:
+        # NAMES_FILE also keeps the runs of start order; a log from before
+        # they were tracked is read as one unordered run
+        runs = names.get('runs')
+
+        # Sessions are yielded straight from the mapping, never collected in a list
+        with self._mapped() as (view, count):
+            size = self.RECORD.size
+            ranges = [(0, count, False)] if runs is None else _run_ranges(runs, 0, count, since, until)
+            for first, last, ordered in ranges:
+                # Within a run records are in start order (give or take
+                # ORDER_SLACK), so bisect to the window instead of reading it all
+                first, last = min(first, count), min(last, count)
+                if since is not None and ordered:
+                    first = self._bisect(view, first, last, since - ORDER_SLACK)
+                if until is not None and ordered:
+                    last = self._bisect(view, first, last, until + ORDER_SLACK)
+                window = view[first * size:last * size]
+                records = self.RECORD.iter_unpack(window)
+                try:
+                    for start, duration, p, t in records:
+                        if ((not project or p == project_id) and (not task or t == task_id)
+                                and (since is None or start >= since) and (until is None or start < until)):
+                            yield projects[p], tasks[t], start, duration
+                finally:
+                    del records
+                    window.release()
+
+
+class PartitionedStorage:
+    """Monthly CSV partitions (logs/2026-10.csv), each with its own rollup.
+
+    Every partition is a CSV log in the usual format whose sidecar index
+    (logs/2026-10.idx) doubles as the month's rollup of per-(project, task)
+    totals. Sealed months never change, so all-time totals are the sum of
+    the rollups, and a query bounded by date only opens the months it
+    overlaps. Sessions are filed under the month they start in.
+    """
+
+    name = 'partitioned'
+
+    @property
+    def path(self):
+        return PARTITION_DIR
+
+    def exists(self):
+        return bool(self._partitions())
+
+    def _partitions(self):
+        """Return [(month start epoch, next month start epoch, path)] in month order."""
+        if not os.path.isdir(PARTITION_DIR):
+            return []
+        partitions = []
+        for name in sorted(os.listdir(PARTITION_DIR)):
+            match = PARTITION_NAME.match(name)
+            if match is None:
+                continue
+            year, month = int(match.group(1)), int(match.group(2))
+            start = to_epoch(datetime(year, month, 1))
+            end = to_epoch(datetime(year + month // 12, month % 12 + 1, 1))
+            partitions.append((start, end, os.path.join(PARTITION_DIR, name)))
+        return partitions
+
+    def _partition_path(self, start_time):
+        return os.path.join(PARTITION_DIR, start_time.strftime('%Y-%m') + '.csv')
+
+    def append(self, project, task, start_time, end_time):
+        self.append_many([(project, task, start_time, end_time)])
+
+    def append_many(self, sessions):
+        """Append sessions to the partitions of their start months, one write per partition."""
+        os.makedirs(PARTITION_DIR, exist_ok=True)
+        by_partition = defaultdict(list)
+        for session in sessions:
+            by_partition[self._partition_path(session[2])].append(session)
+        for path, partition_sessions in by_partition.items():
+            CSVStorage(path).append_many(partition_sessions)
+
+    def bulk_load(self, sessions):
+        """Replace the partitions with `sessions`, filing each under its start month."""
+        _forget_import_keys(self)
+        os.makedirs(PARTITION_DIR, exist_ok=True)
+        for _, _, path in self._partitions():
+            os.unlink(path)
+            if os.path.exists(_index_path(path)):
+                os.unlink(_index_path(path))
+
+        files, writers = {}, {}
+        count = 0
+        try:
+            for project, task, start, duration in sessions:
+                start_time = from_epoch(start)
+                path = self._partition_path(start_time)
+                writer = writers.get(path)
+                if writer is None:
+                    files[path] = open(path, 'w', newline='', buffering=1 << 20)
+                    writer = writers[path] = csv.writer(files[path])
+                    writer.writerow(LOG_FIELDNAMES)
+                end_time = start_time + timedelta(seconds=duration)
+                writer.writerow([start_time.strftime('%Y-%m-%d'), project, task, start_time.strftime('%H:%M:%S'),
+                                 end_time.strftime('%H:%M:%S'), str(timedelta(seconds=duration)), start, duration])
+                count += 1
+        finally:
+            for f in files.values():
+                f.close()
+        return count
+
+    def totals(self):
+        totals = {}
+        for _, _, path in self._partitions():
+            for project, tasks in CSVStorage(path).totals().items():
+                project_totals = totals.setdefault(project, {})
+                for task, seconds in tasks.items():
+                    project_totals[task] = project_totals.get(task, 0) + seconds
+        return totals
+
+    def task_total(self, project, task):
+        return sum(CSVStorage(path).task_total(project, task) for _, _, path in self._partitions())
+
+    def daily_totals(self):
+        # A session is filed under the month it starts in but can run past
+        # midnight into the next month, so days are summed, not just joined
+        days = {}
+        for _, _, path in self._partitions():
+            for project, tasks in CSVStorage(path).daily_totals().items():
+                for task, task_days in tasks.items():
+                    merged = days.setdefault(project, {}).setdefault(task, {})
+                    for day, seconds in task_days.items():
+                        merged[day] = merged.get(day, 0) + seconds
+        return days
+
+    def iter_sessions(self, project=None, task=None, since=None, until=None):
+        for start, end, path in self._partitions():
+            if since is not None and end <= since:
+                continue
+            if until is not None and start >= until:
+                continue
+            yield from CSVStorage(path).iter_sessions(project, task, since, until)
+
+    def chunks(self, jobs, since=None, until=None):
+        """Byte ranges over the partitions overlapping the window, about `jobs` in all."""
+        partitions = [path for start, end, path in self._partitions()
+                      if (since is None or end > since) and (until is None or start < until)]
+        total = sum(os.path.getsize(path) for path in partitions) or 1
+        chunks = []
+        for path in partitions:
+            pieces = max(1, round(jobs * os.path.getsize(path) / total))
+            chunks.extend(CSVStorage(path).chunks(pieces, since, until))
+        return chunks
+
+
+STORAGE_BACKENDS = {
+    CSVStorage.name: CSVStorage,
+    SQLiteStorage.name: SQLiteStorage,
+    BinaryStorage.name: BinaryStorage,
+    PartitionedStorage.name: PartitionedStorage,
+}
+
+_storage = None
+
+def get_storage():
+    """Return the storage backend selected by the 'storage' config key."""
+    global _storage
+    if _storage is None:
+        backend = STORAGE_BACKENDS.get(load_config().get('storage', 'csv'), CSVStorage)
+        _storage = backend()
+    return _storage
+
+def _import_time(value):
+    """Return a wall-clock epoch for an imported timestamp, or None if it can't be read.
+
+    Accepts Unix timestamps (numbers, decimal strings, or the 8-digit hex
+    strings Chronologicon writes) and ISO 8601 strings; times with a zone
+    are converted to local time, like the rest of the log.
+    """
+    try:
+        if isinstance(value, (int, float)):
+            return to_epoch(datetime.fromtimestamp(value))
+        value = value.strip()
+        if re.fullmatch(r'[0-9a-fA-F]{8}', value):
+            return to_epoch(datetime.fromtimestamp(int(value, 16)))
+        if value.isdigit():
+            return to_epoch(datetime.fromtimestamp(int(value)))
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is not None:
+            moment = moment.astimezone().replace(tzinfo=None)
+        return to_epoch(moment)
+    except (AttributeError, TypeError, ValueError, OverflowError, OSError):
+        return None
+
+
+def _import_entry(entry):
+    """Normalize one JSON entry into (project, task, start, end) epochs, or None.
+
+    Chronologicon entries use t (project), d (description), c (sector),
+    s and e (start and end); spelled-out keys are accepted as well.
+    """
+    if not isinstance(entry, dict):
+        return None
+    project = entry.get('t', entry.get('project'))
+    task = entry.get('d') or entry.get('c') or entry.get('task') or entry.get('activity') or ''
+    start = _import_time(entry.get('s', entry.get('start')))
+    end = _import_time(entry.get('e', entry.get('end')))
+    if not project or start is None or end is None:
+        return None
+    return str(project), str(task), start, end
+
+
+def _read_import_json(f):
+    data = json.load(f)
+    entries = data.get('log', []) if isinstance(data, dict) else data
+    for entry in entries:
+        yield _import_entry(entry)
+
+
+def _read_import_csv(f):
+    reader = csv.reader(f)
+    header = next(reader, [])
+    if {'Project', 'Task', 'Duration'}.issubset(header):
+        # A log written by this tool (or an --export-csv copy of one)
+        parse = _csv_session_parser(header)
+        for row in reader:
+            session = parse(row)
+            yield None if session is None else (session[0], session[1], session[2], session[2] + session[3])
         return
+    columns = {name.strip().lower(): i for i, name in enumerate(header)}
+    if not {'project', 'start', 'end'}.issubset(columns):
+        raise ValueError("CSV needs Project/Task/Duration log columns or project, task, start and end columns")
+    for row in reader:
+        yield _import_entry({key: row[i] for key, i in columns.items() if i < len(row)})
+
+
+def read_import_file(path):
+    """Stream (project, task, start epoch, end epoch) tuples, or None for unusable entries, from `path`.
+
+    .csv files are read row by row. .jsonl/.ndjson files hold one entry per
+    line; other files are read as one JSON document (a list of entries or a
+    Chronologicon export with a "log" list), which has to be parsed whole.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == '.csv':
+            yield from _read_import_csv(f)
+        elif extension in ('.jsonl', '.ndjson'):
+            for line in f:
+                if line.strip():
+                    try:
+                        yield _import_entry(json.loads(line))
+                    except ValueError:
+                        yield None
+        else:
+            yield from _read_import_json(f)
+
+
+def _session_key(project, task, start, end):
+    """64-bit key of a session for duplicate detection."""
+    import hashlib
+    digest = hashlib.blake2b(f"{project}\x1f{task}\x1f{start}\x1f{end}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _import_keys_path(storage):
+    """The import keys of a storage backend: productivity_log.csv -> productivity_log.csv.imported."""
+    return storage.path + '.imported'
+
+
+def _forget_import_keys(storage):
+    """Drop a storage's import keys before its contents are replaced; they are recomputed when next needed."""
+    try:
+        os.unlink(_import_keys_path(storage))
+    except FileNotFoundError:
+        pass
 
-    fieldnames = ['Date', 'Project', 'Task', 'Start Time', 'End Time', 'Duration']
-    
-    log_entry = {
-        'Date': start_time.strftime('%Y-%m-%d'),
-        'Project': project,
-        'Task': task,
-        'Start Time': start_time.strftime('%H:%M:%S'),
-        'End Time': end_time.strftime('%H:%M:%S'),
-        'Duration': str(duration)
-    }
-
-    file_exists = os.path.isfile(LOG_FILE)
-    if file_exists:
-        with open(LOG_FILE, 'r', newline='') as f:
-            reader = csv.reader(f)
-            header = next(reader, None)
-            if header != fieldnames:
-                # If header doesn't match, assume old format or corrupted, and rewrite
-                # For simplicity, we'll just create a new file with the correct header
-                # In a real app, you might want to migrate data or warn the user.
-                file_exists = False # Force rewrite
-
-    with open(LOG_FILE, 'a' if file_exists else 'w', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        writer.writerow(log_entry)
 
-def generate_summary_report():
+def _storage_stamp(storage):
+    """(st_dev, st_ino) of the storage's file or directory, or None if it doesn't exist."""
+    try:
+        st = os.stat(storage.path)
+    except FileNotFoundError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _load_import_keys(storage):
+    """Return (keys of the sessions already in `storage`, whether the key file must be rewritten).
+
+    The key file starts with the stamp of the storage it was written for.
+    If the storage has since been deleted, replaced or rewritten (--archive
+    and header migrations replace the CSV log), the keys are recomputed
+    from the sessions the storage actually holds.
+    """
+    stamp = _storage_stamp(storage)
+    if stamp is None:
+        return set(), True
+    keys = array('Q')
+    try:
+        with open(_import_keys_path(storage), 'rb') as f:
+            keys.frombytes(f.read())
+    except (OSError, ValueError):
+        keys = array('Q')
+    if tuple(keys[:2]) == stamp:
+        return set(keys[2:]), False
+    return {_session_key(project, task, start, start + duration)
+            for project, task, start, duration in storage.iter_sessions()}, True
+
+
+def import_sessions(path):
+    """Import sessions from `path` into the active storage; return (imported, duplicates, unusable).
+
+    Sessions are written IMPORT_BATCH at a time through append_many. The key
+    of every imported session is kept next to the storage (see
+    _load_import_keys), so running the same import again adds nothing. Keys
+    are saved after their batch is written: an interrupted import can at
+    worst repeat its last batch.
+    """
+    storage = get_storage()
+    seen, stale = _load_import_keys(storage)
+    keys_path = _import_keys_path(storage)
+    imported = duplicates = unusable = 0
+    batch, batch_keys = [], array('Q')
+
+    def flush():
+        nonlocal stale
+        storage.append_many(batch)
+        if stale:
+            # Start the key file over, stamped with the storage as it is now
+            keys = array('Q', _storage_stamp(storage))
+            keys.extend(seen)
+            with open(keys_path + '.tmp', 'wb') as f:
+                keys.tofile(f)
+            os.replace(keys_path + '.tmp', keys_path)
+            stale = False
+        else:
+            with open(keys_path, 'ab') as f:
+                batch_keys.tofile(f)
+        batch.clear()
+        del batch_keys[:]
+
+    for session in read_import_file(path):
+        if session is None or session[3] - session[2] < 1:
+            unusable += 1
+            continue
+        key = _session_key(*session)
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        project, task, start, end = session
+        batch.append((project, task, from_epoch(start), from_epoch(end)))
+        batch_keys.append(key)
+        imported += 1
+        if len(batch) >= IMPORT_BATCH:
+            flush()
+    if batch:
+        flush()
+    return imported, duplicates, unusable
+
+
+def migrate_csv(backend_name, force=False):
+    """Bulk-load the CSV log into another backend and switch storage to it.
+
+    Loading replaces the target's contents, so a target that already holds
+    sessions (say, ones logged to it since an earlier migration) is left
+    alone unless `force` is set.
+    """
     if not os.path.isfile(LOG_FILE):
         console.print(f"[yellow]Log file '{LOG_FILE}' not found.[/yellow]")
         return
+    target = STORAGE_BACKENDS[backend_name]()
+    try:
+        if not force and target.exists() and next(iter(target.iter_sessions()), None) is not None:
+            console.print(f"[yellow]'{target.path}' already holds sessions, which migrating would replace. "
+                          f"Use --force to overwrite them.[/yellow]")
+            return
+        count = target.bulk_load(CSVStorage().iter_sessions())
+    except LogFormatError:
+        _print_outdated_warning()
+        return
+    config = load_config()
+    config['storage'] = backend_name
+    save_config(config)
+    skipped = _count_undated_rows(LOG_FILE)
+    print(f"Migrated {count} sessions from {LOG_FILE} to {target.path}; storage set to {backend_name}.")
+    if skipped:
+        console.print(f"[yellow]Skipped {skipped} rows of {LOG_FILE} with a Duration but no readable Date.[/yellow]")
+
+def _count_undated_rows(log_file):
+    """Count the rows of a CSV log that have a Duration but can't be placed in time.
+
+    Only the live log is read: archiving leaves such rows behind in it.
+    """
+    with open(log_file, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if not {'Project', 'Task', 'Duration'}.issubset(header):
+            return 0
+        parse = _csv_session_parser(header)
+        duration_col = header.index('Duration')
+        return sum(1 for row in reader
+                   if len(row) > duration_col and row[duration_col] and parse(row) is None)
+
+def archive_log(before, compression='gzip', log_file=None):
+    """Move the sessions starting before date `before` into a compressed archive segment.
+
+    The moved rows are written unchanged to a new segment under the log's
+    archive directory, with a JSON summary of their totals and a daily
+    rollup; the remaining rows (and any that can't be dated) replace the
+    log atomically, under the append lock. Returns (archived, kept, segment
+    path), with a path of None when nothing was old enough.
+    """
+    log_file = log_file or LOG_FILE
+    cutoff = (before.toordinal() - EPOCH_ORDINAL) * DAY
+    archive_dir = _archive_dir(log_file)
+    numbers = [int(name.partition('_')[0]) for name in os.listdir(archive_dir)
+               if name.endswith('.json') and name.partition('_')[0].isdigit()] if os.path.isdir(archive_dir) else []
+    number = max(numbers, default=0) + 1
+    tmp_segment = os.path.join(archive_dir, f'{number:04d}.tmp')
+    tmp_log = log_file + '.archiving'
+    if compression == 'lzma':
+        import lzma
+        open_segment = lzma.open
+    else:
+        import gzip
+        open_segment = gzip.open
+
+    while True:
+        with open(log_file, 'rb') as raw:
+            fcntl.flock(raw, fcntl.LOCK_EX)
+            if not _is_current_log(raw, log_file):
+                continue  # the log was replaced while we waited for the lock
+            header, _ = CSVStorage(log_file)._read_header(raw)
+            parse = _csv_session_parser(header)
+            os.makedirs(archive_dir, exist_ok=True)
+            summary = {'version': INDEX_VERSION, 'header': header, 'rows': 0, 'first_start': None,
+                       'last_start': None, 'last_end': None, 'disorder': 0,
+                       'totals': {}, 'sessions': {}, 'heatmap': {}}
+            days = {}
+            kept = 0
+            with open_segment(tmp_segment, 'wt', encoding='utf-8', newline='') as segment, \
+                    open(tmp_log, 'w', newline='') as hot:
+                archive_writer, hot_writer = csv.writer(segment), csv.writer(hot)
+                archive_writer.writerow(header)
+                hot_writer.writerow(header)
+                # The wrapper is detached below: closing it would close `raw` and drop the lock
+                text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+                for row in csv.reader(text):
+                    session = parse(row)
+                    if session is None or session[2] >= cutoff:
+                        hot_writer.writerow(row)
+                        kept += 1
+                        continue
+                    archive_writer.writerow(row)
+                    project, task, start, seconds = session
+                    summary['rows'] += 1
+                    if summary['first_start'] is None or start < summary['first_start']:
+                        summary['first_start'] = start
+                    summary['last_start'], summary['disorder'] = _track_order(
+                        start, summary['last_start'], summary['disorder'])
+                    if summary['last_end'] is None or start + seconds > summary['last_end']:
+                        summary['last_end'] = start + seconds
+                    tasks = summary['totals'].setdefault(project, {})
+                    tasks[task] = tasks.get(task, 0) + seconds
+                    counts = summary['sessions'].setdefault(project, {})
+                    counts[task] = counts.get(task, 0) + 1
+                    # The same weekday-by-hour bins ReportData.add_session fills
+                    heatmap = summary['heatmap'].setdefault(project, {}).setdefault(task, [0] * (7 * 24))
+                    for k, part in split_into_bins(start, seconds, HOUR, MONDAY_ORIGIN):
+                        heatmap[k % (7 * 24)] += part
+                    task_days = days.setdefault(project, {}).setdefault(task, {})
+                    for day, part in split_into_bins(start, seconds, DAY):
+                        task_days[str(day)] = task_days.get(str(day), 0) + part
+                text.detach()
+
+            if not summary['rows']:
+                os.unlink(tmp_segment)
+                os.unlink(tmp_log)
+                return 0, kept, None
+            first, last = (from_epoch(summary[key]).strftime('%Y-%m-%d') for key in ('first_start', 'last_start'))
+            name = f'{number:04d}_{first}_{last}'
+            summary['file'] = name + ARCHIVE_COMPRESSIONS[compression]
+            summary['rollup'] = name + '.rollup'
+            segment_path = os.path.join(archive_dir, summary['file'])
+            os.replace(tmp_segment, segment_path)
+            _save_log_index({'version': INDEX_VERSION, 'days': days}, os.path.join(archive_dir, summary['rollup']))
+            # The summary makes the segment visible to readers, so it goes last
+            _save_log_index(summary, os.path.join(archive_dir, name + '.json'))
+            os.replace(tmp_log, log_file)
+            # The sidecars describe the old log; they are rebuilt from the new one
+            for sidecar in (_index_path(log_file), _rollup_path(log_file)):
+                if os.path.exists(sidecar):
+                    os.unlink(sidecar)
+            return summary['rows'], kept, segment_path
+
+def export_csv(path):
+    """Write every session in the active storage to a CSV file in the log's format."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(LOG_FIELDNAMES)
+        for project, task, start, duration in get_storage().iter_sessions():
+            start_time = from_epoch(start)
+            end_time = start_time + timedelta(seconds=duration)
+            writer.writerow([start_time.strftime('%Y-%m-%d'), project, task, start_time.strftime('%H:%M:%S'),
+                             end_time.strftime('%H:%M:%S'), str(timedelta(seconds=duration)), start, duration])
+    print(f"Exported {get_storage().path} to {path}.")
 
-    project_times = defaultdict(timedelta)
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        try:
-            for row in reader:
-                project_times[row['Project']] += parse_duration(row['Duration'])
-        except KeyError:
-            console.print(f"[bold red]Warning:[/bold red] The log file '{LOG_FILE}' has an outdated format. Please delete it to start a new log.")
+def get_historical_time(project, task):
+    storage = get_storage()
+    if not storage.exists():
+        return "0:00:00"
+    try:
+        seconds = storage.task_total(project, task)
+    except LogFormatError:
+        _print_outdated_warning()
+        return "0:00:00"
+    return str(timedelta(seconds=seconds))
+
+def log_session(project, task, start_time, end_time):
+    duration = end_time - start_time
+    if duration.total_seconds() < 1:
+        return
+    get_storage().append(project, task, start_time, end_time)
+
+def log_sessions(sessions):
+    """log_session for many (project, task, start_time, end_time) sessions, written in one batch."""
+    sessions = [session for session in sessions if (session[3] - session[2]).total_seconds() >= 1]
+    if sessions:
+        get_storage().append_many(sessions)
+
+def split_into_bins(start, duration, width, origin=0):
+    """Yield (bin, seconds) for every bin the session [start, start + duration) overlaps.
+
+    Bin k covers [origin + k * width, origin + (k + 1) * width); only integer
+    arithmetic on epoch seconds is used, so no datetime objects are built.
+    """
+    end = start + duration
+    k = (start - origin) // width
+    edge = origin + (k + 1) * width
+    while start < end:
+        stop = min(end, edge)
+        yield k, stop - start
+        start = stop
+        k += 1
+        edge += width
+
+def bin_totals(starts, durations, width, period, origin=0):
+    """Total seconds per bin (modulo `period`) over whole columns of sessions.
+
+    With NumPy the columns are bucketed without a Python-level loop: each
+    session contributes a partial first and last bin, whole cycles of
+    `period` bins, and a run of whole bins added through a difference array.
+    Returns a list of `period` ints.
+    """
+    if _numpy() is None:
+        totals = [0] * period
+        for start, duration in zip(starts, durations):
+            for k, seconds in split_into_bins(start, duration, width, origin):
+                totals[k % period] += seconds
+        return totals
+
+    starts = np.asarray(starts, dtype=np.int64) - origin
+    ends = starts + np.asarray(durations, dtype=np.int64)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    first = starts // width
+    last = (ends - 1) // width
+    totals = np.bincount(first % period, weights=np.minimum(ends, (first + 1) * width) - starts,
+                         minlength=period)
+
+    spans = last > first
+    first, last, ends = first[spans], last[spans], ends[spans]
+    totals += np.bincount(last % period, weights=ends - last * width, minlength=period)
+    inner = last - first - 1
+    totals += (inner // period).sum() * width
+    begin = (first + 1) % period
+    runs = (np.bincount(begin, minlength=2 * period + 1)
+            - np.bincount(begin + inner % period, minlength=2 * period + 1))
+    runs = np.cumsum(runs)[:2 * period] * width
+    totals += runs[:period] + runs[period:]
+    return [int(round(seconds)) for seconds in totals]
+
+
+class ReportData:
+    """Aggregates for every report section, filled in a single pass over the log.
+
+    Sessions are bucketed into a weekday-by-hour grid (hour-of-day and weekday
+    totals are its row and column sums) and into the last `days` calendar
+    days. Sessions that cross an hour or midnight are split at the boundary.
+    """
+
+    def __init__(self, project_name=None, task_name=None, days=30, today=None):
+        self.project_name = project_name
+        self.task_name = task_name
+        self.days = days
+        self.today = today or datetime.now().date()
+        self.outdated_format = False
+        self.count_totals = False  # set for windowed reports, whose totals come from the sessions read
+        self.session_count = 0
+        self.project_times = defaultdict(timedelta)  # all projects, unfiltered
+        self.task_times = defaultdict(timedelta)     # tasks matching the filter
+        self.pair_seconds = defaultdict(int)         # (project, task) -> seconds, unfiltered
+        self.user_seconds = defaultdict(int)         # (user, project, task) -> seconds, team reports only
+        self.heatmap_seconds = [0] * (7 * 24)        # weekday (Mon=0) * 24 + hour
+        self.recent_seconds = [0] * days             # days ago -> seconds
+        today_start = (self.today.toordinal() - EPOCH_ORDINAL) * DAY
+        self.window_start = today_start - (days - 1) * DAY
+        self.window_end = today_start + DAY
+
+    @property
+    def hourly_seconds(self):
+        return [sum(self.heatmap_seconds[hour::24]) for hour in range(24)]
+
+    @property
+    def weekday_seconds(self):
+        return [sum(self.heatmap_seconds[day * 24:(day + 1) * 24]) for day in range(7)]
+
+    def add_totals(self, totals):
+        """Fill project/task totals from {project: {task: seconds}}."""
+        for project, tasks in totals.items():
+            for task, seconds in tasks.items():
+                self.project_times[project] += timedelta(seconds=seconds)
+                self.pair_seconds[project, task] += seconds
+                if project != self.project_name:
+                    continue
+                if self.task_name and task != self.task_name:
+                    continue
+                self.task_times[task] += timedelta(seconds=seconds)
+
+    def add_session(self, project, task, start, seconds):
+        """Add one session (start epoch, duration seconds) to the time-of-day and date bins."""
+        if self.count_totals:
+            self.project_times[project] += timedelta(seconds=seconds)
+            self.pair_seconds[project, task] += seconds
+        if self.project_name and project != self.project_name:
+            return
+        if self.task_name and task != self.task_name:
             return
+        if self.count_totals and self.project_name:
+            self.task_times[task] += timedelta(seconds=seconds)
+        self.session_count += 1
+
+        heatmap = self.heatmap_seconds
+        for k, part in split_into_bins(start, seconds, HOUR, MONDAY_ORIGIN):
+            heatmap[k % (7 * 24)] += part
+
+        low, high = max(start, self.window_start), min(start + seconds, self.window_end)
+        if low < high:
+            for k, part in split_into_bins(low, high - low, DAY, self.window_start):
+                self.recent_seconds[self.days - 1 - k] += part
+
+    def add_summary(self, summary):
+        """Add an archived segment from its summary, as add_session would add its matching sessions.
+
+        The summary has no daily bins, so the segment must have ended before
+        the recent-days window.
+        """
+        for project, tasks in summary['heatmap'].items():
+            if self.project_name and project != self.project_name:
+                continue
+            for task, bins in tasks.items():
+                if self.task_name and task != self.task_name:
+                    continue
+                seconds = summary['totals'][project][task]
+                if self.count_totals:
+                    self.project_times[project] += timedelta(seconds=seconds)
+                    self.pair_seconds[project, task] += seconds
+                    if self.project_name:
+                        self.task_times[task] += timedelta(seconds=seconds)
+                self.session_count += summary['sessions'][project][task]
+                self.heatmap_seconds = [a + b for a, b in zip(self.heatmap_seconds, bins)]
+
+    def merge(self, other):
+        """Add in the bins and counted totals of `other`, built with the same filter and window."""
+        for project, total in other.project_times.items():
+            self.project_times[project] += total
+        for task, total in other.task_times.items():
+            self.task_times[task] += total
+        for pair, seconds in other.pair_seconds.items():
+            self.pair_seconds[pair] += seconds
+        for key, seconds in other.user_seconds.items():
+            self.user_seconds[key] += seconds
+        self.heatmap_seconds = [a + b for a, b in zip(self.heatmap_seconds, other.heatmap_seconds)]
+        self.recent_seconds = [a + b for a, b in zip(self.recent_seconds, other.recent_seconds)]
+        self.session_count += other.session_count
+
+    def add_columns(self, starts, durations):
+        """Vectorized add_session for NumPy columns of already-filtered sessions."""
+        self.session_count += len(starts)
+        for i, seconds in enumerate(bin_totals(starts, durations, HOUR, 7 * 24, MONDAY_ORIGIN)):
+            self.heatmap_seconds[i] += seconds
+
+        lows = np.maximum(starts, self.window_start)
+        highs = np.minimum(starts + durations, self.window_end)
+        keep = lows < highs
+        recent = bin_totals(lows[keep], (highs - lows)[keep], DAY, self.days, self.window_start)
+        for k, seconds in enumerate(recent):
+            self.recent_seconds[self.days - 1 - k] += seconds
+
+
+class Session:
+    """A view of one row of a SessionStore; unpacks as (project, task, start, duration)."""
+
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index):
+        self.store = store
+        self.index = index
+
+    @property
+    def project(self):
+        return self.store.projects[self.store.project_ids[self.index]]
+
+    @property
+    def task(self):
+        return self.store.tasks[self.store.task_ids[self.index]]
+
+    @property
+    def start(self):
+        return self.store.starts[self.index]
+
+    @property
+    def duration(self):
+        return self.store.durations[self.index]
+
+    @property
+    def end(self):
+        return self.start + self.duration
+
+    def __iter__(self):
+        return iter((self.project, self.task, self.start, self.duration))
+
+    def __repr__(self):
+        return f"Session({self.project!r}, {self.task!r}, {self.start}, {self.duration})"
+
+
+class SessionStore:
+    """Sessions held in memory as typed columns, for features that need them all at once.
+
+    Project and task names are interned into integer ids (projects and
+    tasks are numbered separately), and each session is four machine
+    integers in array columns, about 20 bytes instead of a tuple of objects;
+    ten million sessions take about 200 MB. Indexing or iterating yields
+    Session views. Any generate_* function accepts a store as its `data`.
+    """
+
+    def __init__(self):
+        self.projects, self.tasks = [], []
+        self._project_ids, self._task_ids = {}, {}
+        self.project_ids = array('i')
+        self.task_ids = array('i')
+        self.starts = array('q')
+        self.durations = array('i')
+
+    @classmethod
+    def load(cls, storage=None, since=None, until=None):
+        """Read the sessions of `storage` (the active one by default), optionally bounded by start time."""
+        storage = storage or get_storage()
+        store = cls()
+        if storage.exists():
+            store.extend(storage.iter_sessions(since=since, until=until))
+        return store
+
+    def _intern(self, names, ids, name):
+        key = ids.get(name)
+        if key is None:
+            key = ids[name] = len(names)
+            names.append(name)
+        return key
+
+    def append(self, project, task, start, duration):
+        self.project_ids.append(self._intern(self.projects, self._project_ids, project))
+        self.task_ids.append(self._intern(self.tasks, self._task_ids, task))
+        self.starts.append(start)
+        self.durations.append(duration)
+
+    def extend(self, sessions):
+        for session in sessions:
+            self.append(*session)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('session index out of range')
+        return Session(self, index)
+
+    def __iter__(self):
+        return (Session(self, i) for i in range(len(self)))
+
+    def nbytes(self):
+        """Bytes held by the columns."""
+        return sum(column.itemsize * len(column)
+                   for column in (self.project_ids, self.task_ids, self.starts, self.durations))
+
+    def totals(self):
+        """Return {project: {task: seconds}}, like the storage backends."""
+        sums = defaultdict(int)
+        for project_id, task_id, seconds in zip(self.project_ids, self.task_ids, self.durations):
+            sums[project_id, task_id] += seconds
+        totals = {}
+        for (project_id, task_id), seconds in sums.items():
+            totals.setdefault(self.projects[project_id], {})[self.tasks[task_id]] = seconds
+        return totals
+
+    def columns(self, project=None, task=None):
+        """Return NumPy (starts, durations) int64 columns of the matching sessions."""
+        np = _numpy()
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        durations = np.frombuffer(self.durations, dtype=np.int32).astype(np.int64)
+        mask = None
+        for name, names, ids in ((project, self._project_ids, self.project_ids),
+                                 (task, self._task_ids, self.task_ids)):
+            if name:
+                matches = np.frombuffer(ids, dtype=np.int32) == names.get(name, -1)
+                mask = matches if mask is None else mask & matches
+        if mask is None:
+            return starts.copy(), durations
+        return starts[mask], durations[mask]
+
+    def report_data(self, project_name=None, task_name=None, days=30):
+        """Aggregate the store into a ReportData, vectorized when NumPy is installed."""
+        data = ReportData(project_name, task_name, days)
+        data.add_totals(self.totals())
+        if _numpy() is not None:
+            data.add_columns(*self.columns(project_name, task_name))
+        else:
+            for session in zip(map(self.projects.__getitem__, self.project_ids),
+                               map(self.tasks.__getitem__, self.task_ids), self.starts, self.durations):
+                data.add_session(*session)
+        return data
+
+
+class DailyRollup:
+    """Seconds per day for every (project, task): the cube behind --group-by and the calendar.
+
+    Every backend keeps it up to date as sessions are written: CSV and
+    partitioned logs and the binary log in incremental sidecars, SQLite in
+    its daily table. Week, month and year totals are sums over days, so
+    they cost O(days) however many sessions the log holds.
+    """
+
+    PERIODS = ['week', 'month', 'year']
+
+    def __init__(self):
+        self.days = {}  # {project: {task: {epoch day: seconds}}}
+
+    @classmethod
+    def load(cls, storage=None):
+        storage = storage or get_storage()
+        rollup = cls()
+        if not storage.exists():
+            return rollup
+        rollup.merge(storage.daily_totals())
+        return rollup
+
+    def merge(self, days):
+        """Add {project: {task: {day: seconds}}}, where days may be strings as stored in JSON."""
+        for project, tasks in days.items():
+            for task, task_days in tasks.items():
+                merged = self.days.setdefault(project, {}).setdefault(task, {})
+                for day, seconds in task_days.items():
+                    merged[int(day)] = merged.get(int(day), 0) + seconds
+
+    def day_totals(self, project=None, task=None, first_day=None, last_day=None):
+        """Return {epoch day: seconds} for the filter, limited to days in [first_day, last_day]."""
+        totals = defaultdict(int)
+        for name, tasks in self.days.items():
+            if project and name != project:
+                continue
+            for task_name, task_days in tasks.items():
+                if task and task_name != task:
+                    continue
+                for day, seconds in task_days.items():
+                    if first_day is not None and day < first_day:
+                        continue
+                    if last_day is not None and day > last_day:
+                        continue
+                    totals[day] += seconds
+        return totals
+
+    @staticmethod
+    def period_label(day, period):
+        """Label of the week (ISO, e.g. 2026-W42), month (2026-10) or year containing epoch `day`."""
+        d = date.fromordinal(EPOCH_ORDINAL + day)
+        if period == 'week':
+            year, week, _ = d.isocalendar()
+            return f"{year}-W{week:02d}"
+        if period == 'month':
+            return f"{d.year}-{d.month:02d}"
+        return str(d.year)
+
+    def group(self, period, project=None, task=None, first_day=None, last_day=None):
+        """Return [(label, seconds)] per week, month or year, in date order."""
+        totals = defaultdict(int)
+        for day, seconds in self.day_totals(project, task, first_day, last_day).items():
+            totals[self.period_label(day, period)] += seconds
+        return sorted(totals.items())
+
+
+class Profiler:
+    """Wall time and row counts per phase, plus timer tick latencies, for --profile.
+
+    Phases keep the order they were first recorded in. Instrumented code
+    checks the module-level `profiler`, which is None unless profiling is on,
+    so a normal run pays nothing for it.
+    """
+
+    def __init__(self):
+        self.phases = {}  # name -> [seconds, rows, calls]
+        self.ticks = []   # (render seconds, drift seconds) per timer tick
+
+    def add(self, name, seconds, rows=0):
+        phase = self.phases.setdefault(name, [0.0, 0, 0])
+        phase[0] += seconds
+        phase[1] += rows
+        phase[2] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name, rows=0):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started, rows)
+
+    def timed(self, name, fn):
+        """Wrap `fn` so each call adds its time and one row to `name`."""
+        clock = time.perf_counter
+        phase = self.phases.setdefault(name, [0.0, 0, 0])
+        phase[2] += 1
+
+        def wrapper(*args):
+            started = clock()
+            try:
+                return fn(*args)
+            finally:
+                phase[0] += clock() - started
+                phase[1] += 1
+        return wrapper
+
+    def aggregate(self, data, sessions, prefix):
+        """Feed `sessions` into `data`, timing reading and aggregation separately."""
+        clock = time.perf_counter
+        read = aggregate = 0.0
+        rows = 0
+        sessions = iter(sessions)
+        while True:
+            started = clock()
+            session = next(sessions, None)
+            fetched = clock()
+            read += fetched - started
+            if session is None:
+                break
+            data.add_session(*session)
+            aggregate += clock() - fetched
+            rows += 1
+        self.add(f'{prefix}: read sessions', read, rows)
+        self.add(f'{prefix}: aggregate bins', aggregate, rows)
+
+    def summary(self):
+        """Return the collected numbers as a JSON-serializable dict."""
+        result = {'phases': [
+            {'phase': name, 'seconds': seconds, 'rows': rows, 'calls': calls}
+            for name, (seconds, rows, calls) in self.phases.items()
+        ]}
+        if self.ticks:
+            render = sorted(tick[0] for tick in self.ticks)
+            drift = sorted(abs(tick[1]) for tick in self.ticks)
+            result['timer'] = {
+                'ticks': len(self.ticks),
+                'render_mean_ms': 1000 * sum(render) / len(render),
+                'render_p95_ms': 1000 * render[int(0.95 * (len(render) - 1))],
+                'render_max_ms': 1000 * render[-1],
+                'drift_mean_ms': 1000 * sum(drift) / len(drift),
+                'drift_p95_ms': 1000 * drift[int(0.95 * (len(drift) - 1))],
+                'drift_max_ms': 1000 * drift[-1],
+            }
+        return result
+
+    def print_summary(self):
+        from rich.table import Table
+
+        summary = self.summary()
+        table = Table(title="Profile")
+        table.add_column("Phase", style="cyan")
+        table.add_column("Wall time", justify="right", style="magenta")
+        table.add_column("Rows", justify="right")
+        table.add_column("Rows/s", justify="right")
+        table.add_column("Calls", justify="right", style="dim")
+        for phase in summary['phases']:
+            rate = f"{phase['rows'] / phase['seconds']:,.0f}" if phase['rows'] and phase['seconds'] else "-"
+            table.add_row(phase['phase'], f"{phase['seconds'] * 1000:.1f} ms",
+                          f"{phase['rows']:,}" if phase['rows'] else "-", rate, str(phase['calls']))
+        if summary['phases']:
+            console.print(table)
+        timer = summary.get('timer')
+        if timer:
+            console.print(
+                f"[bold]Timer ticks:[/bold] {timer['ticks']}  "
+                f"[bold]render[/bold] mean {timer['render_mean_ms']:.2f} ms, p95 {timer['render_p95_ms']:.2f} ms, max {timer['render_max_ms']:.2f} ms  "
+                f"[bold]drift[/bold] mean {timer['drift_mean_ms']:.2f} ms, p95 {timer['drift_p95_ms']:.2f} ms, max {timer['drift_max_ms']:.2f} ms"
+            )
+
+
+profiler = None  # the active Profiler while --profile is on
+
+
+def _profile_phase(name, rows=0):
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name, rows)
+
+
+def _aggregate_chunk(chunk, project_name, task_name, since, until, days, today, count_totals):
+    """Aggregate one byte range from a backend's chunks() in a worker process.
+
+    Returns (ReportData, stopped), where stopped says the range reached a row
+    past `until`, after which a serial pass would have stopped reading.
+    """
+    path, header, start, end, ordered, _ = chunk
+    data = ReportData(project_name, task_name, days, today)
+    data.count_totals = count_totals
+    with _open_archive(path) if end is None else open(path, 'rb') as raw:
+        rows = csv.reader(raw) if end is None else csv.reader(_iter_lines(raw, start, end))
+        if end is None:
+            next(rows, None)  # an archived segment starts with its header
+        sessions = _filter_sessions(rows, _csv_session_parser(header), project_name, task_name,
+                                    since, until, ordered)
+        while True:
+            try:
+                session = next(sessions)
+            except StopIteration as done:
+                return data, done.value
+            data.add_session(*session)
+
+
+def _aggregate_parallel(storage, data, jobs, since=None, until=None):
+    """Fill `data` from the storage's byte-range chunks, aggregated by `jobs` processes.
+
+    Partial results are merged in log order, and the remaining chunks of a
+    run are skipped once one of them stops past `until`, so the result is
+    the same as a serial pass over iter_sessions.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunks = storage.chunks(jobs, since, until)
+    stopped_runs = set()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_aggregate_chunk, chunk, data.project_name, data.task_name,
+                               since, until, data.days, data.today, data.count_totals)
+                   for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            partial, stopped = future.result()
+            if (chunk[0], chunk[5]) in stopped_runs:
+                continue
+            data.merge(partial)
+            if stopped:
+                stopped_runs.add((chunk[0], chunk[5]))
+
+
+def load_report_data(project_name=None, task_name=None, days=30, since=None, until=None, jobs=1):
+    """Return a ReportData for the active storage, or None if it has no log yet.
+
+    Totals come from the backend's aggregate query; the bins take one pass
+    over the matching sessions, vectorized when the backend exposes columns
+    and NumPy is installed, or split across `jobs` processes for CSV logs.
+    With `since`/`until` (epoch seconds bounding the session start) only that
+    window is read and the totals cover it alone.
+    """
+    storage = get_storage()
+    if not storage.exists():
+        return None
+    data = ReportData(project_name, task_name, days)
+    windowed = since is not None or until is not None
+    try:
+        if windowed:
+            data.count_totals = True
+        else:
+            with _profile_phase('load: storage totals'):
+                data.add_totals(storage.totals())
+            if storage.name == CSVStorage.name:
+                # Old sessions come from the archive summaries; the rest read the live log
+                with _profile_phase('load: archived segments'):
+                    add_archived_sessions(data, storage.path)
+                storage = CSVStorage(storage.path, archived=False)
+
+        if jobs > 1 and hasattr(storage, 'chunks'):
+            with _profile_phase(f'load: aggregate in {jobs} processes'):
+                _aggregate_parallel(storage, data, jobs, since, until)
+        elif not windowed and hasattr(storage, 'session_columns') and _numpy() is not None:
+            with _profile_phase('load: read columns'):
+                columns = storage.session_columns(project_name, task_name)
+            with _profile_phase('load: aggregate bins', len(columns[0])):
+                data.add_columns(*columns)
+        else:
+            sessions = storage.iter_sessions(project_name, task_name, since, until)
+            if profiler is not None:
+                profiler.aggregate(data, sessions, 'load')
+            else:
+                for session in sessions:
+                    data.add_session(*session)
+    except LogFormatError:
+        data.outdated_format = True
+    return data
+
+
+def find_team_logs(pattern):
+    """Return [(user, path)] for a directory of CSV logs or a glob pattern.
+
+    A directory contributes its *.csv files and any */productivity_log.csv
+    one level down. Each log belongs to the user named by its file name, or
+    by its directory when the file has the default log name.
+    """
+    if os.path.isdir(pattern):
+        paths = glob.glob(os.path.join(pattern, '*.csv')) + glob.glob(os.path.join(pattern, '*', LOG_FILE))
+    else:
+        paths = glob.glob(pattern)
+    logs = []
+    for path in sorted(paths):
+        user = os.path.splitext(os.path.basename(path))[0]
+        if user == os.path.splitext(LOG_FILE)[0]:
+            user = os.path.basename(os.path.dirname(os.path.abspath(path)))
+        logs.append((user, path))
+    return logs
+
+
+def _tag_sessions(user, first, sessions):
+    """Yield `first` and then `sessions`, each prefixed with `user`."""
+    yield (user,) + first
+    for session in sessions:
+        yield (user,) + session
+
+
+def iter_team_sessions(logs, project=None, task=None, since=None, until=None):
+    """Merge the sessions of several users' CSV logs in start-time order.
+
+    `logs` is [(user, path)] as from find_team_logs; sessions come out as
+    (user, project, task, start epoch, duration seconds). Every log is
+    streamed with its own date window and heapq.merge holds one pending row
+    per log, so memory does not grow with the logs. Nothing is written next
+    to the logs, which may be read-only or shared. Logs that are missing,
+    unreadable or in an outdated format are skipped with a warning on stderr.
+    """
+    streams = []
+    for user, path in logs:
+        storage = CSVStorage(path, save_sidecars=False)
+        try:
+            with open(path, 'rb') as raw:
+                storage._read_header(raw)
+            sessions = storage.iter_sessions(project, task, since, until)
+            # Opening the stream reads the log's index, so its errors surface here
+            first = next(sessions, None)
+        except (OSError, LogFormatError):
+            print(f"Warning: skipping '{path}', which is not a readable productivity log.", file=sys.stderr)
+            continue
+        if first is not None:
+            streams.append(_tag_sessions(user, first, sessions))
+    return heapq.merge(*streams, key=lambda session: session[3])
+
+
+def load_team_report_data(logs, project_name=None, task_name=None, days=30, since=None, until=None):
+    """Return a ReportData over several users' logs, with per-user totals in user_seconds."""
+    data = ReportData(project_name, task_name, days)
+    data.count_totals = True
+    with _profile_phase('load: merge team logs'):
+        for user, project, task, start, seconds in iter_team_sessions(logs, project_name, task_name, since, until):
+            data.add_session(project, task, start, seconds)
+            data.user_seconds[user, project, task] += seconds
+    return data
+
+
+def _print_user_table(data, by_task):
+    """Print the per-user breakdown of a team report, by project or (for a project report) by task."""
+    from rich.table import Table
+
+    rows = defaultdict(int)
+    for (user, project, task), seconds in data.user_seconds.items():
+        rows[user, task if by_task else project] += seconds
+    total = sum(rows.values())
+
+    table = Table()
+    table.add_column("User", style="cyan")
+    table.add_column("Task" if by_task else "Project", style="magenta")
+    table.add_column("Time Spent", style="green")
+    table.add_column("Percentage", style="blue")
+    for (user, name), seconds in sorted(rows.items()):
+        percentage = seconds / total * 100 if total else 0
+        table.add_row(user, name, str(timedelta(seconds=seconds)), f"{percentage:.2f}%")
+    console.print("Time by User")
+    console.print(table)
+
+
+def _legend_display(value_per_hash_seconds):
+    if value_per_hash_seconds < 60:
+        return f"{int(value_per_hash_seconds)}s"
+    if value_per_hash_seconds < 3600:
+        return f"{int(value_per_hash_seconds / 60)}m"
+    return f"{value_per_hash_seconds / 3600:.1f}h"
+
+def _print_outdated_warning():
+    console.print(f"[bold red]Warning:[/bold red] The log file '{get_storage().path}' has an outdated format. Please delete it to start a new log.")
+
+
+def generate_summary_report(data=None):
+    from rich.table import Table
+
+    if isinstance(data, SessionStore):
+        data = data.report_data()
+    elif data is None:
+        data = load_report_data()
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
+        return
+    if data.outdated_format:
+        _print_outdated_warning()
+        return
+
+    project_times = data.project_times
 
     if not project_times:
         console.print("[yellow]No data found in log file.[/yellow]")
@@ -135,23 +2465,24 @@ def generate_summary_report():
     console.print("Overall Productivity Summary")
     console.print(table)
     console.print(f"[bold]Grand total time for all projects:[/bold] {grand_total_time}")
-
-def generate_project_report(project_name, task_name=None):
-    if not os.path.isfile(LOG_FILE):
-        console.print(f"[yellow]Log file '{LOG_FILE}' not found.[/yellow]")
+    if data.user_seconds:
+        _print_user_table(data, by_task=False)
+
+def generate_project_report(project_name, task_name=None, data=None):
+    from rich.table import Table
+
+    if isinstance(data, SessionStore):
+        data = data.report_data(project_name, task_name)
+    elif data is None:
+        data = load_report_data(project_name, task_name)
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
+        return
+    if data.outdated_format:
+        _print_outdated_warning()
         return
 
-    task_times = defaultdict(timedelta)
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        try:
-            for row in reader:
-                if row.get('Project') == project_name:
-                    if task_name is None or row.get('Task') == task_name:
-                        task_times[row['Task']] += parse_duration(row['Duration'])
-        except KeyError:
-            console.print(f"[bold red]Warning:[/bold red] The log file '{LOG_FILE}' has an outdated format. Please delete it to start a new log.")
-            return
+    task_times = data.task_times
 
     if not task_times:
         if task_name:
@@ -180,53 +2511,29 @@ def generate_project_report(project_name, task_name=None):
     console.print(title)
     console.print(table)
     console.print(f"[bold]Total time for selection: [/bold] {total_project_time}")
+    if data.user_seconds:
+        _print_user_table(data, by_task=True)
 
-def generate_daily_graph(project_name=None, task_name=None):
+def generate_daily_graph(project_name=None, task_name=None, data=None):
     title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
     title_task = '' if task_name is None else f', Task: {task_name}'
     console.print(f"\n[bold cyan]Daily Productivity Graph ({title_project}{title_task})[/bold cyan]")
 
-    if not os.path.isfile(LOG_FILE):
-        console.print(f"[yellow]Log file '{LOG_FILE}' not found.[/yellow]")
+    if isinstance(data, SessionStore):
+        data = data.report_data(project_name, task_name)
+    elif data is None:
+        data = load_report_data(project_name, task_name)
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
         return
 
-    daily_data = defaultdict(timedelta)
-    days_of_week = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        try:
-            for row in reader:
-                if project_name and row.get('Project') != project_name:
-                    continue
-                if task_name and row.get('Task') != task_name:
-                    continue
-
-                date_str = row.get('Date')
-                duration_str = row.get('Duration')
-
-                if not date_str or not duration_str:
-                    continue
-
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    day_of_week = date_obj.weekday()  # Monday is 0 and Sunday is 6
-                    duration = parse_duration(duration_str)
-                    daily_data[day_of_week] += duration
-                except (ValueError, KeyError):
-                    continue
-        except KeyError:
-            console.print(f"[bold red]Warning:[/bold red] The log file '{LOG_FILE}' has an outdated format. Please delete it to start a new log.")
-            return
-
+    daily_data = data.weekday_seconds
 
-    if not daily_data:
+    if not data.session_count:
         console.print("[yellow]No data found for graph generation.[/yellow]")
         return
 
-    max_duration_for_scaling = 0
-    for duration in daily_data.values():
-        max_duration_for_scaling = max(max_duration_for_scaling, duration.total_seconds())
+    max_duration_for_scaling = max(daily_data)
 
     if max_duration_for_scaling == 0:
         console.print("[yellow]No productive time recorded for graph generation.[/yellow]")
@@ -241,7 +2548,7 @@ def generate_daily_graph(project_name=None, task_name=None):
     for level in range(max_bar_height, 0, -1):
         line_parts = []
         for i in range(7):
-            duration_seconds = daily_data[i].total_seconds()
+            duration_seconds = daily_data[i]
             bar_height = int((duration_seconds / max_duration_for_scaling) * max_bar_height)
             line_parts.append(cell("#") if bar_height >= level else " " * CELL_W)
         console.print("".join(line_parts))
@@ -249,88 +2556,37 @@ def generate_daily_graph(project_name=None, task_name=None):
     tick_row = "".join(cell("-") for _ in range(7))
     console.print(tick_row)
 
-    label_row = "".join(cell(day) for day in days_of_week)
+    label_row = "".join(cell(day) for day in DAYS_OF_WEEK)
     console.print(label_row)
 
     value_per_hash_seconds = max_duration_for_scaling / max_bar_height
-    if value_per_hash_seconds < 60:
-        legend_display = f"{int(value_per_hash_seconds)}s"
-    elif value_per_hash_seconds < 3600:
-        legend_display = f"{int(value_per_hash_seconds / 60)}m"
-    else:
-        legend_display = f"{value_per_hash_seconds / 3600:.1f}h"
-    console.print(f"One # represents approximately {legend_display} of activity.")
+    console.print(f"One # represents approximately {_legend_display(value_per_hash_seconds)} of activity.")
 
 
-def generate_hourly_graph(project_name=None, task_name=None):
+def generate_hourly_graph(project_name=None, task_name=None, data=None):
     title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
     title_task = '' if task_name is None else f', Task: {task_name}'
     console.print(f"\n[bold cyan]Hourly Productivity Graph ({title_project}{title_task})[/bold cyan]")
 
-    if not os.path.isfile(LOG_FILE):
-        console.print(f"[yellow]Log file '{LOG_FILE}' not found.[/yellow]")
+    if isinstance(data, SessionStore):
+        data = data.report_data(project_name, task_name)
+    elif data is None:
+        data = load_report_data(project_name, task_name)
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
         return
 
-    hourly_data = defaultdict(timedelta)
-    max_duration_seconds = 0
-
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        try:
-            for row in reader:
-                if project_name and row.get('Project') != project_name:
-                    continue
-                if task_name and row.get('Task') != task_name:
-                    continue
-
-                start_time_str = row.get('Start Time')
-                duration_str = row.get('Duration')
-
-                if not start_time_str or not duration_str:
-                    continue
-
-                try:
-                    start_datetime_str = row.get('Date') + " " + start_time_str
-                    start_datetime = datetime.strptime(start_datetime_str, '%Y-%m-%d %H:%M:%S')
-                    duration = parse_duration(duration_str)
-                    end_datetime = start_datetime + duration
-
-                    current_time = start_datetime
-                    while current_time < end_datetime:
-                        hour = current_time.hour
-                        next_hour_boundary = current_time.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
-                        
-                        time_in_this_hour = min(end_datetime, next_hour_boundary) - current_time
-                        hourly_data[hour] += time_in_this_hour
-                        current_time = next_hour_boundary
-
-                except ValueError:
-                    # Handle cases where time parsing might fail
-                    continue
-        except KeyError:
-            console.print(f"[bold red]Warning:[/bold red] The log file '{LOG_FILE}' has an outdated format. Please delete it to start a new log.")
-            return
+    hourly_data = data.hourly_seconds
 
-
-    if not hourly_data:
+    if not data.session_count:
         console.print("[yellow]No data found for graph generation.[/yellow]")
         return
 
-    # Determine max duration for scaling
-    for duration in hourly_data.values():
-        max_duration_seconds = max(max_duration_seconds, duration.total_seconds())
-
-    if max_duration_seconds == 0:
-        console.print("[yellow]No productive time recorded for graph generation.[/yellow]")
-        return
-
     # Generate ASCII histogram
     max_bar_height = 10  # Max height of the histogram bars
 
     # Find the maximum duration to scale the bars
-    max_duration_for_scaling = 0
-    for duration in hourly_data.values():
-        max_duration_for_scaling = max(max_duration_for_scaling, duration.total_seconds())
+    max_duration_for_scaling = max(hourly_data)
 
     if max_duration_for_scaling == 0:
         console.print("[yellow]No productive time recorded for graph generation.[/yellow]")
@@ -347,7 +2603,7 @@ def generate_hourly_graph(project_name=None, task_name=None):
     for level in range(max_bar_height, 0, -1):
         line_parts = []
         for hour in range(24):
-            duration_seconds = hourly_data[hour].total_seconds()
+            duration_seconds = hourly_data[hour]
             bar_height = int((duration_seconds / max_duration_for_scaling) * max_bar_height)
             line_parts.append(cell("#") if bar_height >= level else " " * CELL_W)
         console.print("".join(line_parts))
@@ -363,50 +2619,28 @@ def generate_hourly_graph(project_name=None, task_name=None):
     )
     console.print(label_row)
 
-    # Legend (unchanged)
+    # Legend
     value_per_hash_seconds = max_duration_for_scaling / max_bar_height
-    if value_per_hash_seconds < 60:
-        legend_display = f"{int(value_per_hash_seconds)}s"
-    elif value_per_hash_seconds < 3600:
-        legend_display = f"{int(value_per_hash_seconds / 60)}m"
-    else:
-        legend_display = f"{value_per_hash_seconds / 3600:.1f}h"
-    console.print(f"One # represents approximately {legend_display} of activity.")
+    console.print(f"One # represents approximately {_legend_display(value_per_hash_seconds)} of activity.")
 
 
-def generate_recent_history_graph(project_name=None, task_name=None, days=30):
+def generate_recent_history_graph(project_name=None, task_name=None, days=30, data=None):
     title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
     title_task = '' if task_name is None else f', Task: {task_name}'
     console.print(f"\n[bold cyan]Recent History Histogram ({title_project}{title_task})[/bold cyan]")
 
-    if not os.path.isfile(LOG_FILE):
-        console.print(f"[yellow]Log file '{LOG_FILE}' not found.[/yellow]")
+    if isinstance(data, SessionStore):
+        data = data.report_data(project_name, task_name, days)
+    elif data is None or data.days != days:
+        # Only the window is read; a day of margin catches sessions running past midnight into it
+        today_start = (datetime.now().date().toordinal() - EPOCH_ORDINAL) * DAY
+        data = load_report_data(project_name, task_name, days, since=today_start - days * DAY)
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
         return
 
-    # Track hours per day (key = days ago)
-    today = datetime.now().date()
-    daily_hours = {d: 0.0 for d in range(days)}  # store hours
-    max_hours = 0.0
-
-    with open(LOG_FILE, 'r', newline='') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if project_name and row.get('Project') != project_name:
-                continue
-            if task_name and row.get('Task') != task_name:
-                continue
-
-            try:
-                session_date = datetime.strptime(row['Date'], "%Y-%m-%d").date()
-                delta_days = (today - session_date).days
-                if 0 <= delta_days < days:
-                    duration = parse_duration(row['Duration'])
-                    hours = duration.total_seconds() / 3600
-                    daily_hours[delta_days] += hours
-                    max_hours = max(max_hours, daily_hours[delta_days])
-            except (ValueError, KeyError):
-                continue
-
+    daily_hours = [seconds / 3600 for seconds in data.recent_seconds]
+    max_hours = max(daily_hours, default=0.0)
 
     if max_hours == 0:
         console.print("[yellow]No recent activity found.[/yellow]")
@@ -438,14 +2672,733 @@ def generate_recent_history_graph(project_name=None, task_name=None, days=30):
     console.print("X-axis = days ago (00 = today, increases to the left).")
 
 
-def run_timer(project_name, task, interval_minutes):
-    seconds = 0
-    color_index = 0
-    block_count = 1
+def generate_heatmap(project_name=None, task_name=None, data=None):
+    title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
+    title_task = '' if task_name is None else f', Task: {task_name}'
+    console.print(f"\n[bold cyan]Weekday x Hour Heatmap ({title_project}{title_task})[/bold cyan]")
+
+    if isinstance(data, SessionStore):
+        data = data.report_data(project_name, task_name)
+    elif data is None:
+        data = load_report_data(project_name, task_name)
+    if data is None:
+        console.print(f"[yellow]Log file '{get_storage().path}' not found.[/yellow]")
+        return
+
+    if not data.session_count:
+        console.print("[yellow]No data found for graph generation.[/yellow]")
+        return
+
+    heatmap = data.heatmap_seconds
+    max_cell_seconds = max(heatmap)
+    if max_cell_seconds == 0:
+        console.print("[yellow]No productive time recorded for graph generation.[/yellow]")
+        return
+
+    shades = " .:-=+*#%@"
+    CELL_W = 2  # characters per hour "column", matching the hourly graph
+
+    def shade(seconds):
+        if seconds == 0:
+            return shades[0]
+        # Any activity gets at least the faintest mark
+        return shades[max(1, int(seconds / max_cell_seconds * (len(shades) - 1)))]
+
+    for day, day_name in enumerate(DAYS_OF_WEEK):
+        row = "".join(shade(heatmap[day * 24 + hour]) + " " * (CELL_W - 1) for hour in range(24))
+        console.print(f"{day_name} {row}")
+
+    label_row = "".join(
+        (f"{h:02d}" + " " * (CELL_W - 2)) if h % 3 == 0 else (" " * CELL_W)
+        for h in range(24)
+    )
+    console.print(f"    {label_row}")
+    console.print(f"Shades '{shades[1:]}' go from lightest to heaviest; '@' is about {_legend_display(max_cell_seconds)} in one slot.")
+
+
+def generate_period_report(period, project_name=None, task_name=None, since=None, until=None, rollup=None):
+    """Print time per week, month or year from the daily rollup, optionally within [since, until)."""
+    from rich.table import Table
+
+    title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
+    title_task = '' if task_name is None else f', Task: {task_name}'
+    if rollup is None:
+        try:
+            rollup = DailyRollup.load()
+        except LogFormatError:
+            _print_outdated_warning()
+            return
+    first_day = None if since is None else since // DAY
+    last_day = None if until is None else (until - 1) // DAY
+    periods = rollup.group(period, project_name, task_name, first_day, last_day)
+    if not periods:
+        console.print("[yellow]No data found in log file.[/yellow]")
+        return
+
+    longest = max(seconds for _, seconds in periods)
+    table = Table()
+    table.add_column(period.capitalize(), style="magenta")
+    table.add_column("Time Spent", style="green")
+    table.add_column("", style="blue")
+    for label, seconds in periods:
+        table.add_row(label, str(timedelta(seconds=seconds)), "#" * round(seconds / longest * 30) if longest else "")
+    console.print(f"Time by {period.capitalize()} ({title_project}{title_task})")
+    console.print(table)
+    console.print(f"[bold]Total time for selection:[/bold] {timedelta(seconds=sum(seconds for _, seconds in periods))}")
+
+
+def generate_calendar_heatmap(project_name=None, task_name=None, end=None, rollup=None):
+    """Print a year-long calendar of daily time, one column per week, ending on `end` (a date, default today)."""
+    title_project = 'All Projects' if project_name is None else f'Project: {project_name}'
+    title_task = '' if task_name is None else f', Task: {task_name}'
+    console.print(f"\n[bold cyan]Calendar Heatmap ({title_project}{title_task})[/bold cyan]")
+
+    if rollup is None:
+        try:
+            rollup = DailyRollup.load()
+        except LogFormatError:
+            _print_outdated_warning()
+            return
+    end = end or datetime.now().date()
+    last_day = end.toordinal() - EPOCH_ORDINAL
+    # Columns run Monday to Sunday, so the grid starts on the Monday 52 weeks back
+    first_day = last_day - end.weekday() - 52 * 7
+    totals = rollup.day_totals(project_name, task_name, first_day, last_day)
+    max_day_seconds = max(totals.values(), default=0)
+    if max_day_seconds == 0:
+        console.print("[yellow]No productive time recorded in the last year.[/yellow]")
+        return
+
+    shades = " .:-=+*#%@"
+
+    def shade(day):
+        if day > last_day:
+            return " "
+        seconds = totals.get(day, 0)
+        if seconds == 0:
+            return "·"
+        return shades[max(1, int(seconds / max_day_seconds * (len(shades) - 1)))]
+
+    weeks = (last_day - first_day) // 7 + 1
+    month_row = [" "] * weeks
+    for week in range(weeks):
+        d = date.fromordinal(EPOCH_ORDINAL + first_day + week * 7)
+        # Label the first week holding a month's 1st, if the label fits
+        if (week == 0 or d.day <= 7) and all(c == " " for c in month_row[max(0, week - 1):week + 3]):
+            month_row[week:week + 3] = d.strftime('%b')
+    console.print("    " + "".join(month_row)[:weeks + 2])
+    for weekday, day_name in enumerate(DAYS_OF_WEEK):
+        console.print(f"{day_name} " + "".join(shade(first_day + week * 7 + weekday) for week in range(weeks)))
+    console.print(f"Shades '{shades[1:]}' go from lightest to heaviest; '@' is about {_legend_display(max_day_seconds)} in a day; '·' is a day with none.")
+
+
+def _project_records(data):
+    for project, total in sorted(data.project_times.items()):
+        if data.project_name and project != data.project_name:
+            continue
+        yield {'project': project, 'seconds': int(total.total_seconds())}
+
+
+def _task_records(data):
+    for (project, task), seconds in sorted(data.pair_seconds.items()):
+        if data.project_name and project != data.project_name:
+            continue
+        if data.task_name and task != data.task_name:
+            continue
+        yield {'project': project, 'task': task, 'seconds': int(seconds)}
+
+
+def _recent_records(data):
+    for days_ago in range(data.days - 1, -1, -1):
+        day = data.today - timedelta(days=days_ago)
+        yield {'date': day.isoformat(), 'seconds': int(data.recent_seconds[days_ago])}
+
+
+def _user_records(data):
+    for (user, project, task), seconds in sorted(data.user_seconds.items()):
+        yield {'user': user, 'project': project, 'task': task, 'seconds': int(seconds)}
+
+
+def iter_report_sections(data):
+    """Return (section, records) pairs for the report aggregates; records are generated lazily.
+
+    Sections are `project` and `task` totals (narrowed by the report's
+    filter), per-`user` totals (empty unless several logs were merged),
+    then the `hourly`, `daily` (weekday), `heatmap` and `recent` bins.
+    Every record has a whole number of `seconds`.
+    """
+    return [
+        ('project', _project_records(data)),
+        ('task', _task_records(data)),
+        ('user', _user_records(data)),
+        ('hourly', ({'hour': hour, 'seconds': int(seconds)} for hour, seconds in enumerate(data.hourly_seconds))),
+        ('daily', ({'weekday': DAYS_OF_WEEK[day], 'seconds': int(seconds)} for day, seconds in enumerate(data.weekday_seconds))),
+        ('heatmap', ({'weekday': DAYS_OF_WEEK[i // 24], 'hour': i % 24, 'seconds': int(seconds)}
+                     for i, seconds in enumerate(data.heatmap_seconds))),
+        ('recent', _recent_records(data)),
+    ]
+
+
+def write_report(data, fmt, out=None):
+    """Stream the report aggregates to `out` (stdout) as json, csv or ndjson.
+
+    Records are written as they are produced, so memory stays flat however
+    many projects and tasks there are. json is one object with a list per
+    section; csv and ndjson write one record per line tagged with its section.
+    """
+    out = out or sys.stdout
+    sections = iter_report_sections(data)
+    if fmt == 'json':
+        out.write('{')
+        for i, (section, records) in enumerate(sections):
+            out.write(f'{"," if i else ""}\n  {json.dumps(section)}: [')
+            for j, record in enumerate(records):
+                out.write(f'{"," if j else ""}\n    {json.dumps(record)}')
+            out.write('\n  ]')
+        out.write('\n}\n')
+        return
+
+    records = ({'section': section, **record} for section, section_records in sections for record in section_records)
+    if fmt == 'csv':
+        writer = csv.DictWriter(out, fieldnames=REPORT_FIELDNAMES, lineterminator='\n')
+        writer.writeheader()
+        writer.writerows(records)
+    else:
+        for record in records:
+            out.write(json.dumps(record) + '\n')
+
+
+
+def print_report(data, project_name=None, task_name=None, days=30):
+    """Print the full report (summary or project table, then every graph) from one ReportData."""
+    if not project_name:
+        # Summary report for all projects
+        with _profile_phase('render: summary report'):
+            generate_summary_report(data=data)
+    else:
+        # Report for a specific project, optionally narrowed to one task
+        with _profile_phase('render: project report'):
+            generate_project_report(project_name, task_name, data=data)
+    with _profile_phase('render: hourly graph'):
+        generate_hourly_graph(project_name, task_name, data=data)
+    with _profile_phase('render: daily graph'):
+        generate_daily_graph(project_name, task_name, data=data)
+    with _profile_phase('render: heatmap'):
+        generate_heatmap(project_name, task_name, data=data)
+    with _profile_phase('render: recent history'):
+        generate_recent_history_graph(project_name, task_name, days, data=data)
+
+
+class LiveReport:
+    """Report aggregates for a CSV log, kept current by reading only what was appended.
+
+    Each poll() stats the log and, if its size or mtime moved, parses the
+    complete lines past the last offset read and adds them to `data`. A log
+    that was replaced or truncated, or a day window that moved past
+    midnight, makes the next poll start over from the top of the log.
+    """
+
+    def __init__(self, path, project_name=None, task_name=None, days=30):
+        self.path = path
+        self.project_name = project_name
+        self.task_name = task_name
+        self.days = days
+        self.reset()
+
+    def reset(self):
+        self.data = ReportData(self.project_name, self.task_name, self.days)
+        self.data.count_totals = True
+        self.offset = None  # byte offset just past the last complete line read
+        self.parse = None
+        self.identity = None  # (st_dev, st_ino) of the file being followed
+        self.seen = None      # (st_size, st_mtime_ns) at the last poll
+
+    def _complete_lines(self, raw):
+        for line in raw:
+            if not line.endswith(b'\n'):
+                break  # still being written; read it on a later poll
+            self.offset += len(line)
+            yield line.decode('utf-8')
+
+    def poll(self):
+        """Fold newly appended sessions into `data`; return True if anything changed."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        replaced = self.identity is not None and (
+            (st.st_dev, st.st_ino) != self.identity or st.st_size < self.offset)
+        if replaced or self.data.today != datetime.now().date():
+            self.reset()
+        elif (st.st_size, st.st_mtime_ns) == self.seen:
+            return False
+        self.identity, self.seen = (st.st_dev, st.st_ino), (st.st_size, st.st_mtime_ns)
+
+        with open(self.path, 'rb') as raw:
+            started = self.parse is None
+            if started:
+                try:
+                    header, self.offset = CSVStorage(self.path)._read_header(raw)
+                except LogFormatError:
+                    self.data.outdated_format = True
+                    return True
+                self.parse = _csv_session_parser(header)
+                add_archived_sessions(self.data, self.path)
+            raw.seek(self.offset)
+            before = self.data.session_count
+            rows = csv.reader(self._complete_lines(raw))
+            for session in _filter_sessions(rows, self.parse, self.project_name, self.task_name):
+                self.data.add_session(*session)
+        return started or self.data.session_count != before
+
+
+def _render_to_text(render, width):
+    """Run `render`, which prints through the module console, and return its output as rich Text."""
+    from rich.console import Console
+    from rich.text import Text
+
+    global console
+    saved = console
+    buffer = io.StringIO()
+    console = Console(file=buffer, width=width, force_terminal=True, color_system=saved.color_system)
+    try:
+        render()
+    finally:
+        console = saved
+    return Text.from_ansi(buffer.getvalue())
+
+
+def watch_report(project_name=None, task_name=None, days=30, interval=1.0):
+    """Show the report in a live full-screen view that follows appends to the CSV log.
+
+    Only new rows are parsed, so a refresh costs the same however long the
+    history is. Runs until Ctrl+C.
+    """
+    from rich.console import Group
+    from rich.live import Live
+    from rich.text import Text
+
+    storage = get_storage()
+    if storage.name != CSVStorage.name:
+        console.print(f"[bold red]Error:[/bold red] --watch follows the CSV log; the active storage is {storage.name}.")
+        return
+    report = LiveReport(storage.path, project_name, task_name, days)
+    report.poll()
+    try:
+        with Live(auto_refresh=False, screen=True, redirect_stderr=False) as live:
+            while True:
+                status = Text(f"Watching {storage.path}: {report.data.session_count} sessions, "
+                              f"updated {datetime.now():%H:%M:%S}. Ctrl+C to exit.", style="dim")
+                body = _render_to_text(lambda: print_report(report.data, project_name, task_name, days),
+                                       live.console.width)
+                live.update(Group(status, body), refresh=True)
+                time.sleep(interval)
+                while not report.poll():
+                    time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+class Journal:
+    """Append-only write-ahead journal for the running segments of one process.
+
+    ``begin`` records a segment's project, task and start, ``checkpoint``
+    records how far it has run (at most once every `checkpoint_seconds`) and
+    ``end`` marks it as logged. Every record is flushed to the OS at once,
+    so a killed process loses nothing, while fsync is grouped to at most one
+    every `fsync_seconds` to spare slow disks. Each process writes its own
+    file under JOURNAL_DIR; recover_journals() logs what a dead one left open.
+    """
+
+    def __init__(self, checkpoint_seconds=CHECKPOINT_SECONDS, fsync_seconds=FSYNC_SECONDS):
+        os.makedirs(JOURNAL_DIR, exist_ok=True)
+        self.path = os.path.join(JOURNAL_DIR, f'{os.getpid()}.journal')
+        self.checkpoint_seconds = checkpoint_seconds
+        self.fsync_seconds = fsync_seconds
+        self._file = open(self.path, 'a')
+        self._checkpointed_at = {}  # open segment id -> monotonic time of its last record
+        self._next_id = 0
+        self._synced_at = time.monotonic()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        now = time.monotonic()
+        if now - self._synced_at >= self.fsync_seconds:
+            os.fsync(self._file.fileno())
+            self._synced_at = now
+
+    def begin(self, project, task, start_time):
+        segment_id = self._next_id
+        self._next_id += 1
+        self._write({'op': 'begin', 'id': segment_id, 'project': project, 'task': task,
+                     'start': start_time.isoformat()})
+        self._checkpointed_at[segment_id] = time.monotonic()
+        return segment_id
+
+    def checkpoint(self, segment_id):
+        """Record that the segment is still running, if a checkpoint is due."""
+        now = time.monotonic()
+        if now - self._checkpointed_at[segment_id] >= self.checkpoint_seconds:
+            self._write({'op': 'checkpoint', 'id': segment_id, 'at': datetime.now().isoformat()})
+            self._checkpointed_at[segment_id] = now
+
+    def seconds_until_checkpoint(self):
+        """Seconds until the next checkpoint is due, or None with nothing running."""
+        if not self._checkpointed_at:
+            return None
+        due = min(self._checkpointed_at.values()) + self.checkpoint_seconds
+        return max(0.0, due - time.monotonic())
+
+    def end(self, segment_id):
+        self._write({'op': 'end', 'id': segment_id})
+        del self._checkpointed_at[segment_id]
+        if not self._checkpointed_at:
+            # Nothing left to recover, so keep the file from growing
+            self._file.truncate(0)
+
+    def close(self):
+        self._file.close()
+        os.unlink(self.path)
+
+
+def open_journal():
+    config = load_config()
+    return Journal(config.get('checkpoint_interval', CHECKPOINT_SECONDS),
+                   config.get('fsync_interval', FSYNC_SECONDS))
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def recover_journals():
+    """Log the unfinished segments left in journals of processes that died.
+
+    Each segment is logged up to its last checkpoint. A journal is claimed by
+    renaming it first, so two timers starting together never both recover it.
+    Returns the number of segments recovered.
+    """
+    if not os.path.isdir(JOURNAL_DIR):
+        return 0
+    recovered = 0
+    for name in sorted(os.listdir(JOURNAL_DIR)):
+        pid_str, _, suffix = name.partition('.')
+        if suffix != 'journal' or not pid_str.isdigit():
+            continue
+        if int(pid_str) == os.getpid() or _pid_alive(int(pid_str)):
+            continue
+        path = os.path.join(JOURNAL_DIR, name)
+        claimed = f'{path}.recovering-{os.getpid()}'
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            continue
+
+        segments = {}
+        with open(claimed, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn final write
+                if record['op'] == 'begin':
+                    start = datetime.fromisoformat(record['start'])
+                    segments[record['id']] = [record['project'], record['task'], start, start]
+                elif record['op'] == 'checkpoint' and record['id'] in segments:
+                    segments[record['id']][3] = datetime.fromisoformat(record['at'])
+                elif record['op'] == 'end':
+                    segments.pop(record['id'], None)
+        for project, task, start_time, end_time in segments.values():
+            log_session(project, task, start_time, end_time)
+            recovered += 1
+        os.unlink(claimed)
+    return recovered
+
+
+class TimerState:
+    """Start/pause/resume/stop state machine for one (project, task) timer.
+
+    Elapsed time is measured with time.monotonic(), so it follows real time
+    no matter how long rendering takes, while each segment keeps its
+    wall-clock start for log_session. A segment is logged when it ends;
+    with a journal, it is also checkpointed while it runs. Given a `pending`
+    list, ended segments are queued there instead, as (project, task, start,
+    end, journal id), for the owner to log in one batch.
+    """
+
+    def __init__(self, project, task, journal=None, pending=None):
+        self.project = project
+        self.task = task
+        self.journal = journal
+        self.pending = pending
+        self.paused = True
+        self.segment_start = None       # wall-clock start of the running segment
+        self._segment_id = None         # journal id of the running segment
+        self._segment_started_at = 0.0  # monotonic start of the running segment
+        self._banked_seconds = 0.0      # time from segments that already ended
+
+    def start(self):
+        if self.paused:
+            self.segment_start = datetime.now()
+            self._segment_started_at = time.monotonic()
+            if self.journal is not None:
+                self._segment_id = self.journal.begin(self.project, self.task, self.segment_start)
+            self.paused = False
+
+    resume = start
+
+    def pause(self):
+        if not self.paused:
+            self._banked_seconds += time.monotonic() - self._segment_started_at
+            if self.pending is not None:
+                self.pending.append((self.project, self.task, self.segment_start, datetime.now(), self._segment_id))
+            else:
+                log_session(self.project, self.task, self.segment_start, datetime.now())
+                if self.journal is not None:
+                    self.journal.end(self._segment_id)
+            self.paused = True
+
+    def checkpoint(self):
+        if not self.paused and self.journal is not None:
+            self.journal.checkpoint(self._segment_id)
+
+    def stop(self):
+        self.pause()
+        return self.elapsed()
+
+    def elapsed(self):
+        if self.paused:
+            return self._banked_seconds
+        return self._banked_seconds + time.monotonic() - self._segment_started_at
+
+
+def _format_clock(seconds):
+    mins, secs = divmod(int(seconds), 60)
+    hours, mins = divmod(mins, 60)
+    return f'{hours:02d}:{mins:02d}:{secs:02d}'
+
+
+class TimerDaemon:
+    """Headless timer driven by one-line commands on a Unix domain socket.
+
+    Each connection sends a single command and gets a single JSON line back:
+    ``start [PROJECT TASK]``, ``pause``, ``resume``, ``status``, ``stop`` or
+    ``shutdown``. Arguments are split like a shell line, so quote names with
+    spaces. Status is answered from memory without touching the log.
+    """
+
+    def __init__(self, path=SOCKET_FILE):
+        self.path = path
+        self.journal = None
+        self.state = None
+        self.running = True
+
+    def status(self):
+        if self.state is None:
+            return {'ok': True, 'state': 'idle'}
+        elapsed = self.state.elapsed()
+        return {
+            'ok': True,
+            'state': 'paused' if self.state.paused else 'running',
+            'project': self.state.project,
+            'task': self.state.task,
+            'elapsed': round(elapsed, 3),
+            'clock': _format_clock(elapsed),
+        }
+
+    def handle(self, line):
+        try:
+            words = shlex.split(line)
+        except ValueError as e:
+            return {'ok': False, 'error': str(e)}
+        if not words:
+            return {'ok': False, 'error': 'empty command'}
+        command, args = words[0], words[1:]
+
+        if command == 'start' and args:
+            if len(args) != 2:
+                return {'ok': False, 'error': 'usage: start PROJECT TASK'}
+            if self.state is not None:
+                self.state.stop()
+            self.state = TimerState(*args, journal=self.journal)
+            self.state.start()
+        elif command in ('start', 'resume', 'pause', 'stop') and self.state is None:
+            return {'ok': False, 'error': 'no timer; use: start PROJECT TASK'}
+        elif command in ('start', 'resume'):
+            self.state.resume()
+        elif command == 'pause':
+            self.state.pause()
+        elif command in ('stop', 'shutdown'):
+            reply = self.status()
+            if self.state is not None:
+                self.state.stop()
+                reply['state'] = 'stopped'
+            self.state = None
+            self.running = command != 'shutdown'
+            return reply
+        elif command != 'status':
+            return {'ok': False, 'error': f'unknown command: {command}'}
+        return self.status()
+
+    def serve(self):
+        if os.path.exists(self.path):
+            try:
+                send_daemon_command('status', self.path)
+            except OSError:
+                os.unlink(self.path)  # left behind by a daemon that died
+            else:
+                raise RuntimeError(f"A timer daemon is already listening on '{self.path}'.")
+
+        recovered = recover_journals()
+        if recovered:
+            print(f"Recovered {recovered} unfinished segment(s) from an interrupted timer.")
+        self.journal = open_journal()
+
+        import socket
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            # Only the owner may connect; the socket is created with these permissions
+            old_umask = os.umask(0o177)
+            try:
+                server.bind(self.path)
+            finally:
+                os.umask(old_umask)
+            server.listen()
+            while self.running:
+                # Block until a client connects or the running segment needs a
+                # checkpoint; an idle daemon uses no CPU. A checkpoint that fell
+                # due while clients were served is written first, so polling
+                # never starves it, and the timeout stays positive: 0 would
+                # make accept() non-blocking.
+                wait = self.journal.seconds_until_checkpoint()
+                if wait is not None and wait <= 0 and self.state is not None:
+                    self.state.checkpoint()
+                    wait = self.journal.seconds_until_checkpoint()
+                server.settimeout(None if wait is None else max(wait, MIN_ACCEPT_TIMEOUT))
+                try:
+                    conn, _ = server.accept()
+                except TimeoutError:
+                    if self.state is not None:
+                        self.state.checkpoint()
+                    continue
+                # A client that stalls or hangs up only loses its own reply
+                conn.settimeout(CLIENT_TIMEOUT)
+                try:
+                    with conn, conn.makefile('rwb') as stream:
+                        line = stream.readline()
+                        if not line.endswith(b'\n'):
+                            continue  # hung up or timed out before sending a whole command
+                        reply = self.handle(line.decode('utf-8', 'replace'))
+                        stream.write(json.dumps(reply).encode('utf-8') + b'\n')
+                except OSError:
+                    pass
+        finally:
+            # Whatever stops the daemon, the running segment is logged
+            if self.state is not None:
+                self.state.stop()
+            self.journal.close()
+            signal.signal(signal.SIGTERM, previous_sigterm)
+            server.close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class TimerSupervisor:
+    """Several named timers driven by one scheduler in one process.
+
+    Timers share a journal. Segments they end are queued and written by
+    ``flush`` in a single log_sessions call, so pausing everything or
+    exiting costs one append however many timers were running; a queued
+    segment stays open in the journal until it is written.
+    """
+
+    def __init__(self, timers, journal=None):
+        self.journal = journal
+        self.pending = []
+        self.timers = [TimerState(project, task, journal, self.pending) for project, task in timers]
+
+    def toggle(self, index):
+        timer = self.timers[index]
+        if timer.paused:
+            timer.resume()
+        else:
+            timer.pause()
+
+    def toggle_all(self):
+        """Pause every timer if any is running, otherwise resume them all."""
+        if all(timer.paused for timer in self.timers):
+            for timer in self.timers:
+                timer.resume()
+        else:
+            for timer in self.timers:
+                timer.pause()
+
+    def checkpoint(self):
+        for timer in self.timers:
+            timer.checkpoint()
+
+    def flush(self):
+        """Log every queued segment in one batch, then close them in the journal."""
+        if not self.pending:
+            return
+        log_sessions([segment[:4] for segment in self.pending])
+        if self.journal is not None:
+            for segment in self.pending:
+                self.journal.end(segment[4])
+        self.pending.clear()
+
+    def seconds_until_next(self, tick_seconds):
+        """Seconds until some running clock reaches its next tick or a checkpoint
+        is due, or None while every timer is paused."""
+        waits = [tick_seconds - (timer.elapsed() % tick_seconds) + 0.001
+                 for timer in self.timers if not timer.paused]
+        if not waits:
+            return None
+        if self.journal is not None:
+            waits.append(self.journal.seconds_until_checkpoint())
+        return min(waits)
+
+    def stop(self):
+        """Stop every timer, log what was running and return each timer's elapsed seconds."""
+        elapsed = [timer.stop() for timer in self.timers]
+        self.flush()
+        return elapsed
+
+
+def send_daemon_command(command, path=SOCKET_FILE):
+    """Send one command line to a running TimerDaemon and return its decoded reply."""
+    import socket
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(path)
+        with client.makefile('rwb') as stream:
+            stream.write(command.encode('utf-8') + b'\n')
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def run_timer(project_name, task, interval_minutes, refresh_rate=1.0):
+    from rich.console import Group
+    from rich.layout import Layout
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.progress import BarColumn, Progress, TextColumn
+    from rich.text import Text
+
     colors = ['blue', 'green', 'yellow', 'red']
     interval_seconds = interval_minutes * 60
-    paused = False
+    tick_seconds = 1 / refresh_rate
 
+    recovered = recover_journals()
+    if recovered:
+        console.print(f"[yellow]Recovered {recovered} unfinished segment(s) from an interrupted timer.[/yellow]")
     historical_time = get_historical_time(project_name, task)
 
     layout = Layout()
@@ -453,132 +3406,389 @@ def run_timer(project_name, task, interval_minutes):
     footer_text = Text("Enter:pause/resume. Ctrl+C:save and exit.", justify="center", style="dim")
     layout["footer"].update(footer_text)
 
+    # Widgets that never change are built once
+    header_text = f"[bold]Project:[/bold] {project_name}\n[bold]Task:[/bold] {task}\n[bold]Previously Logged:[/bold] {historical_time}"
+    header_panel = Panel(header_text, title="Productivity Timer", border_style="magenta")
+    pause_text = Text("PAUSED (Segment Saved)", justify="center", style="yellow")
+
+    journal = open_journal()
+    state = TimerState(project_name, task, journal)
     old_settings = termios.tcgetattr(sys.stdin)
-    
-    # --- NEW: Track segment start time ---
-    session_start_time = datetime.now() # Overall session start
-    current_segment_start_time = datetime.now() # Start of the current active segment
-    # --- END NEW ---
 
     try:
         tty.setcbreak(sys.stdin.fileno())
         with Live(layout, screen=True, redirect_stderr=False, auto_refresh=False) as live:
+            block = None
+            shown = None  # (block, clock, paused) currently on screen
+            target = None  # elapsed time the last sleep was meant to wake at
+            state.start()
             while True:
-                current_color = colors[color_index % len(colors)]
-                
-                header_text = f"[bold]Project:[/bold] {project_name}\n[bold]Task:[/bold] {task}\n[bold]Previously Logged:[/bold] {historical_time}"
-                header_panel = Panel(header_text, title="Productivity Timer", border_style="magenta")
-                block_text = Text(f"Block {block_count} of {interval_minutes} minutes.", justify="center", style="cyan bold")
-                progress = Progress(
-                    TextColumn(f"[bold {current_color}]" + "Total Time: {task.fields[timer_display]}"),
-                    BarColumn(bar_width=None, style=current_color),
-                    TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                )
-                
-                task_id = progress.add_task("interval_progress", total=interval_seconds, timer_display="00:00:00")
-                main_content = Group(header_panel, block_text, progress)
-                layout["main"].update(main_content)
-                live.refresh()
-
-                for i in range(interval_seconds):
-                    if select.select([sys.stdin], [], [], 0)[0]:
-                        key = sys.stdin.read(1)
-                        if key == '\n':
-                            if not paused:
-                                # --- MODIFIED: Pause logic ---
-                                segment_end_time = datetime.now()
-                                log_session(project_name, task, current_segment_start_time, segment_end_time)
-                                paused = True
-                                pause_start_time = datetime.now() # Record when pause started
-                                pause_text = Text("PAUSED (Segment Saved)", justify="center", style="yellow")
-                                paused_content = Group(header_panel, block_text, progress, pause_text)
-                                layout["main"].update(paused_content)
-                                live.refresh()
-                                while paused:
-                                    if select.select([sys.stdin], [], [], 0.1)[0]:
-                                        key = sys.stdin.read(1)
-                                        if key == '\n':
-                                            paused = False
-                                            # --- MODIFIED: Resume logic ---
-                                            current_segment_start_time = datetime.now() # New segment starts now
-                                            # No need to adjust 'seconds' here, as it's total time.
-                                            # The logging handles segment-wise time.
-                                            break # Exit inner while loop
-                                    time.sleep(0.1) # Small sleep to prevent busy-waiting
-                                continue # Continue outer loop after resume
-                            else:
-                                # This case should ideally not be reached if the inner while loop handles resume
-                                # But as a fallback, if somehow 'paused' is true and we get here,
-                                # it means we are trying to resume.
-                                paused = False
-                                current_segment_start_time = datetime.now()
-                                # No need to adjust 'seconds' here, as it's total time.
-                                # The logging handles segment-wise time.
-                                continue # Continue outer loop after resume
-
-                    if paused:
-                        # This block is now mostly handled by the inner while loop
-                        # but if we somehow get here while paused, we should just continue
-                        # to the next iteration of the outer loop.
-                        continue
-
-                    mins, secs = divmod(seconds, 60)
-                    hours, mins = divmod(mins, 60)
-                    timer_display = f'{hours:02d}:{mins:02d}:{secs:02d}'
-                    progress.update(task_id, advance=1, timer_display=timer_display)
-                    
-                    main_content = Group(header_panel, block_text, progress)
-                    layout["main"].update(main_content)
+                elapsed = state.elapsed()
+                tick_started = time.perf_counter()
+                block_index, block_elapsed = divmod(int(elapsed), interval_seconds)
+
+                if block_index != block:
+                    # A new interval block gets a fresh bar in the next color
+                    block = block_index
+                    current_color = colors[block % len(colors)]
+                    block_text = Text(f"Block {block + 1} of {interval_minutes} minutes.", justify="center", style="cyan bold")
+                    progress = Progress(
+                        TextColumn(f"[bold {current_color}]" + "Total Time: {task.fields[timer_display]}"),
+                        BarColumn(bar_width=None, style=current_color),
+                        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                    )
+                    task_id = progress.add_task("interval_progress", total=interval_seconds, timer_display="00:00:00")
+                    shown = None
+
+                clock = _format_clock(elapsed)
+                if shown != (block, clock, state.paused):
+                    if shown is None or shown[2] != state.paused:
+                        main_content = [header_panel, block_text, progress]
+                        if state.paused:
+                            main_content.append(pause_text)
+                        layout["main"].update(Group(*main_content))
+                    progress.update(task_id, completed=block_elapsed, timer_display=clock)
                     live.refresh()
-                    
-                    time.sleep(1)
-                    seconds += 1
-                
-                color_index += 1
-                block_count += 1
+                    shown = (block, clock, state.paused)
+                if profiler is not None and target is not None:
+                    profiler.ticks.append((time.perf_counter() - tick_started, elapsed - target))
+
+                state.checkpoint()
+
+                # Sleep until the elapsed time reaches the next tick or a
+                # checkpoint is due, or indefinitely while paused; a keypress
+                # wakes us either way.
+                timeout = target = None
+                if not state.paused:
+                    timeout = tick_seconds - (elapsed % tick_seconds) + 0.001
+                    if timeout <= journal.seconds_until_checkpoint():
+                        target = elapsed + timeout
+                    else:
+                        timeout = journal.seconds_until_checkpoint()
+                if select.select([sys.stdin], [], [], timeout)[0]:
+                    target = None
+                    key = sys.stdin.read(1)
+                    if key == '\n':
+                        if state.paused:
+                            state.resume()
+                        else:
+                            state.pause()
 
     except KeyboardInterrupt:
         pass
     finally:
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-        # --- MODIFIED: Final log_session call ---
-        if not paused: # Only log if the timer was running when interrupted
-            final_end_time = datetime.now()
-            log_session(project_name, task, current_segment_start_time, final_end_time)
-        # --- END MODIFIED ---
+        # Only logs if the timer was running when interrupted
+        elapsed = state.stop()
+        journal.close()
         print("\nTimer stopped.")
-        duration_str = str(timedelta(seconds=int(seconds)))
+        duration_str = str(timedelta(seconds=int(elapsed)))
         print(f"Total time spent this session: {duration_str}")
 
+def run_timers(timers, interval_minutes, refresh_rate=1.0):
+    """Run several (project, task) timers on one screen with a row each.
+
+    Keys 1-9 pause or resume a single timer and Enter pauses or resumes
+    them all. One loop sleeps until the nearest clock tick, checkpoint or
+    keypress, then redraws only the rows whose clocks changed.
+    """
+    from rich.layout import Layout
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.progress import BarColumn, Progress, TextColumn
+    from rich.text import Text
+
+    colors = ['blue', 'green', 'yellow', 'red']
+    interval_seconds = interval_minutes * 60
+    tick_seconds = 1 / refresh_rate
+
+    recovered = recover_journals()
+    if recovered:
+        console.print(f"[yellow]Recovered {recovered} unfinished segment(s) from an interrupted timer.[/yellow]")
+
+    journal = open_journal()
+    supervisor = TimerSupervisor(timers, journal)
+
+    layout = Layout()
+    layout.split(*[Layout(name=f"timer{i}", size=3) for i in range(len(timers))],
+                 Layout(name="spacer"), Layout(name="footer", size=1))
+    layout["spacer"].update(Text(""))
+    footer_text = Text(f"1-{len(timers)}:pause/resume a timer. Enter:pause/resume all. Ctrl+C:save and exit.",
+                       justify="center", style="dim")
+    layout["footer"].update(footer_text)
+
+    # Per row: [block, Progress, progress task id, (block, clock, paused) on screen]
+    rows = [[None, None, None, None] for _ in timers]
+    old_settings = termios.tcgetattr(sys.stdin)
+
+    try:
+        tty.setcbreak(sys.stdin.fileno())
+        with Live(layout, screen=True, redirect_stderr=False, auto_refresh=False) as live:
+            wake_at = None  # monotonic time the last sleep was meant to end
+            supervisor.toggle_all()
+            while True:
+                tick_started = time.perf_counter()
+                changed = False
+                for i, timer in enumerate(supervisor.timers):
+                    row = rows[i]
+                    elapsed = timer.elapsed()
+                    block_index, block_elapsed = divmod(int(elapsed), interval_seconds)
+                    if block_index != row[0]:
+                        color = colors[block_index % len(colors)]
+                        row[1] = Progress(
+                            TextColumn(f"[bold {color}]" + "{task.fields[timer_display]}"),
+                            TextColumn(f"[cyan]Block {block_index + 1}"),
+                            BarColumn(bar_width=None, style=color),
+                            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                        )
+                        row[2] = row[1].add_task("interval_progress", total=interval_seconds, timer_display="00:00:00")
+                        row[0], row[3] = block_index, None
+                    clock = _format_clock(elapsed)
+                    if row[3] != (row[0], clock, timer.paused):
+                        if row[3] is None or row[3][2] != timer.paused:
+                            layout[f"timer{i}"].update(Panel(
+                                row[1], title=f"[bold][{i + 1}][/bold] {timer.project} / {timer.task}",
+                                title_align="left", subtitle="[yellow]PAUSED[/yellow]" if timer.paused else None,
+                                border_style="dim" if timer.paused else "magenta"))
+                        row[1].update(row[2], completed=block_elapsed, timer_display=clock)
+                        row[3] = (row[0], clock, timer.paused)
+                        changed = True
+                if changed:
+                    live.refresh()
+                if profiler is not None and wake_at is not None:
+                    profiler.ticks.append((time.perf_counter() - tick_started, time.monotonic() - wake_at))
+
+                supervisor.checkpoint()
+                supervisor.flush()
+
+                timeout = supervisor.seconds_until_next(tick_seconds)
+                wake_at = None if timeout is None else time.monotonic() + timeout
+                if select.select([sys.stdin], [], [], timeout)[0]:
+                    wake_at = None
+                    key = sys.stdin.read(1)
+                    if key == '\n':
+                        supervisor.toggle_all()
+                    elif key.isdigit() and 1 <= int(key) <= len(timers):
+                        supervisor.toggle(int(key) - 1)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+        # Every running timer is logged in one batch
+        elapsed = supervisor.stop()
+        journal.close()
+        print("\nTimers stopped.")
+        for timer, seconds in zip(supervisor.timers, elapsed):
+            print(f"{timer.project} / {timer.task}: {timedelta(seconds=int(seconds))}")
+
+def _parse_date_arg(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date '{value}', expected YYYY-MM-DD")
+
 def main():
     parser = argparse.ArgumentParser(description='A productivity timer with reporting features.')
     parser.add_argument('project_name', type=str, nargs='?', help='The name of the project.')
     parser.add_argument('task', type=str, nargs='?', help='The description of the task.')
     parser.add_argument('--set-interval', type=int, metavar='MINUTES', help='Set the default timer interval in minutes for future runs.')
     parser.add_argument('--interval', type=int, metavar='MINUTES', help='Override the default interval for this run.')
+    parser.add_argument('--refresh-rate', type=float, metavar='HZ', help='Timer redraws per second (default 1, or the refresh_rate config key).')
+    parser.add_argument('--low-power', action='store_true', help=f'Redraw the timer only every {int(1 / LOW_POWER_REFRESH_RATE)} seconds to save CPU.')
+    parser.add_argument('--timer', action='append', nargs=2, metavar=('PROJECT', 'TASK'), help=f'Run several timers on one screen; repeat for each (up to {MAX_TIMERS}, together with the positional project and task if given).')
+    parser.add_argument('--daemon', action='store_true', help=f'Run a headless timer controlled through the Unix socket {SOCKET_FILE}.')
+    parser.add_argument('--ctl', choices=['start', 'pause', 'resume', 'status', 'stop', 'shutdown'], help='Send a command to the timer daemon; start takes the project and task arguments.')
     parser.add_argument('--report', action='store_true', help='Generate a report. Can be filtered by project and task.')
+    parser.add_argument('--since', type=_parse_date_arg, metavar='YYYY-MM-DD', help='Only report sessions starting on or after this date.')
+    parser.add_argument('--until', type=_parse_date_arg, metavar='YYYY-MM-DD', help='Only report sessions starting on or before this date.')
+    parser.add_argument('--format', choices=REPORT_FORMATS, help='Write the report aggregates to stdout as json, csv or ndjson instead of rendering tables and graphs.')
+    parser.add_argument('--watch', nargs='?', type=float, const=1.0, metavar='SECONDS', help='Show the report in a live view that picks up new sessions as they are logged, checking every SECONDS (default 1).')
+    parser.add_argument('--logs', metavar='DIR_OR_GLOB', help="Report on several users' CSV logs at once (a directory or a quoted glob), broken down by user.")
+    parser.add_argument('--group-by', choices=DailyRollup.PERIODS, help='With --report, show time per week, month or year instead of the full report.')
+    parser.add_argument('--calendar', action='store_true', help='With --report, show a year-long calendar heatmap of daily time instead of the full report.')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N', help='Aggregate a CSV or partitioned log in N worker processes (default 1).')
+    parser.add_argument('--days', type=int, default=30, metavar='N', help='Number of days shown in the recent history graph (default 30).')
+    parser.add_argument('--set-storage', choices=sorted(STORAGE_BACKENDS), help='Set the storage backend used for logging and reports.')
+    parser.add_argument('--migrate', nargs='?', const=SQLiteStorage.name, choices=[SQLiteStorage.name, BinaryStorage.name, PartitionedStorage.name], metavar='BACKEND', help=f'Bulk-load {LOG_FILE} into another backend (sqlite, binary or partitioned; default sqlite) and switch to it.')
+    parser.add_argument('--force', action='store_true', help='With --migrate, replace sessions already in the target backend.')
+    parser.add_argument('--export-csv', metavar='PATH', help='Export every session in the active storage to a CSV file.')
+    parser.add_argument('--archive', type=_parse_date_arg, metavar='YYYY-MM-DD', help='Move sessions starting before this date out of the CSV log into a compressed archive segment; reports still include them.')
+    parser.add_argument('--compression', choices=sorted(ARCHIVE_COMPRESSIONS), default='gzip', help='Compression for --archive segments (default gzip; lzma is smaller but slower).')
+    parser.add_argument('--import', dest='import_file', metavar='FILE', help='Import sessions from a Chronologicon JSON export, a JSON Lines file or a CSV file, skipping ones imported before.')
+    parser.add_argument('--profile', nargs='?', const='-', metavar='PATH', help=f'Time each report phase and timer tick; print a summary table, or write JSON to PATH (e.g. {PROFILE_FILE}).')
+    parser.add_argument('--cprofile', metavar='PATH', help='Also dump cProfile statistics to PATH (readable with pstats or snakeviz).')
 
     args = parser.parse_args()
-    
+
+    global console, profiler
+    if not _needs_rich(args):
+        console = _PlainConsole()
+    if args.profile:
+        profiler = Profiler()
+    cprofiler = None
+    if args.cprofile:
+        import cProfile
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+    try:
+        _run(parser, args)
+    finally:
+        if cprofiler is not None:
+            cprofiler.disable()
+            cprofiler.dump_stats(args.cprofile)
+        if profiler is not None:
+            if args.format:
+                # stdout carries the machine-readable report; keep it parseable
+                console = _LazyConsole(stderr=True)
+            if args.profile == '-':
+                profiler.print_summary()
+            else:
+                with open(args.profile, 'w') as f:
+                    json.dump(profiler.summary(), f, indent=2)
+                console.print(f"Profile written to '{args.profile}'.")
+
+
+def _needs_rich(args):
+    """True for the rendered report, the timer and a --profile table; other commands print plain lines."""
+    if args.profile == '-':
+        return True
+    if args.report:
+        return not args.format
+    return not (args.migrate or args.daemon or args.ctl or args.export_csv or args.import_file or args.archive
+                or args.set_interval is not None or args.set_storage is not None)
+
+
+def _run(parser, args):
+
+    if args.migrate:
+        migrate_csv(args.migrate, args.force)
+        return
+
+    if args.daemon:
+        try:
+            TimerDaemon().serve()
+        except RuntimeError as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.ctl:
+        command = args.ctl
+        if args.ctl == 'start' and args.project_name and args.task:
+            command = shlex.join(['start', args.project_name, args.task])
+        try:
+            reply = send_daemon_command(command)
+        except OSError:
+            console.print(f"[bold red]Error:[/bold red] No timer daemon is listening on '{SOCKET_FILE}'.")
+            sys.exit(1)
+        print(json.dumps(reply))
+        if not reply['ok']:
+            sys.exit(1)
+        return
+
+    if args.export_csv:
+        export_csv(args.export_csv)
+        return
+
+    if args.archive:
+        storage = get_storage()
+        if storage.name != CSVStorage.name:
+            parser.error(f'--archive works on the csv storage backend, not {storage.name}')
+        if not storage.exists():
+            console.print(f"[yellow]Log file '{storage.path}' not found.[/yellow]")
+            return
+        try:
+            archived, kept, segment = archive_log(args.archive, args.compression, storage.path)
+        except LogFormatError:
+            _print_outdated_warning()
+            return
+        if segment is None:
+            print(f"No sessions in {storage.path} start before {args.archive}; nothing archived.")
+        else:
+            print(f"Archived {archived} sessions starting before {args.archive} to {segment}; "
+                  f"{kept} rows remain in {storage.path}.")
+        return
+
+    if args.import_file:
+        try:
+            imported, duplicates, unusable = import_sessions(args.import_file)
+        except (OSError, ValueError) as e:
+            console.print(f"[bold red]Error:[/bold red] Could not import '{args.import_file}': {e}")
+            sys.exit(1)
+        print(f"Imported {imported} sessions from {args.import_file} into {get_storage().path}; "
+              f"skipped {duplicates} already imported and {unusable} unusable entries.")
+        return
+
+    if args.format and not args.report:
+        parser.error('--format requires --report')
+    if args.logs and not args.report:
+        parser.error('--logs requires --report')
+    if (args.group_by or args.calendar) and (not args.report or args.format or args.logs):
+        parser.error('--group-by and --calendar need --report and cannot be combined with --format or --logs')
+
+    if args.watch is not None:
+        if args.format or args.logs or args.since or args.until:
+            parser.error('--watch cannot be combined with --format, --logs, --since or --until')
+        if args.watch <= 0:
+            parser.error('--watch interval must be positive')
+        if args.days < 1:
+            parser.error('--days must be at least 1')
+        watch_report(args.project_name, args.task, args.days, args.watch)
+        return
+
     if args.report:
-        if not args.project_name:
-            # Summary report for all projects
-            generate_summary_report()
-            generate_hourly_graph()
-            generate_daily_graph()
-            generate_recent_history_graph()
-        elif not args.task:
-            # Report for a specific project
-            generate_project_report(args.project_name)
-            generate_hourly_graph(args.project_name)
-            generate_daily_graph(args.project_name)
-            generate_recent_history_graph(args.project_name)
+        if args.days < 1:
+            parser.error('--days must be at least 1')
+        if args.jobs < 1:
+            parser.error('--jobs must be at least 1')
+        since = until = None
+        if args.since is not None:
+            since = (args.since.toordinal() - EPOCH_ORDINAL) * DAY
+        if args.until is not None:
+            until = (args.until.toordinal() - EPOCH_ORDINAL + 1) * DAY
+        if (args.since or args.until) and not args.format:
+            console.print(f"[dim]Sessions starting {args.since or 'at any time'} to {args.until or 'now'}[/dim]")
+
+        if args.group_by or args.calendar:
+            # Both read the daily rollup, never the sessions themselves
+            try:
+                with _profile_phase('load: daily rollup'):
+                    rollup = DailyRollup.load()
+            except LogFormatError:
+                _print_outdated_warning()
+                return
+            if args.group_by:
+                with _profile_phase(f'render: by {args.group_by}'):
+                    generate_period_report(args.group_by, args.project_name, args.task, since, until, rollup)
+            if args.calendar:
+                with _profile_phase('render: calendar'):
+                    generate_calendar_heatmap(args.project_name, args.task, args.until, rollup)
+            return
+
+        # One pass over the log feeds every section of the report
+        if args.logs:
+            logs = find_team_logs(args.logs)
+            if not logs:
+                print(f"Error: No logs match '{args.logs}'.", file=sys.stderr)
+                sys.exit(1)
+            data = load_team_report_data(logs, args.project_name, args.task, args.days, since, until)
         else:
-            # Report for a specific task in a project
-            generate_project_report(args.project_name, args.task)
-            generate_hourly_graph(args.project_name, args.task)
-            generate_daily_graph(args.project_name, args.task)
-            generate_recent_history_graph(args.project_name, args.task)
+            data = load_report_data(args.project_name, args.task, args.days, since, until, args.jobs)
+        if args.format:
+            if data is not None and data.outdated_format:
+                print(f"Error: The log file '{get_storage().path}' has an outdated format.", file=sys.stderr)
+                sys.exit(1)
+            try:
+                with _profile_phase(f'render: {args.format}'):
+                    write_report(data or ReportData(args.project_name, args.task, args.days), args.format)
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # The reader (e.g. head) went away; don't complain about it on exit
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return
+        print_report(data, args.project_name, args.task, args.days)
         return
 
 
@@ -590,12 +3800,34 @@ def main():
         print(f"Default timer interval set to {args.set_interval} minutes.")
         return
 
-    if not args.project_name or not args.task:
+    if args.set_storage is not None:
+        config['storage'] = args.set_storage
+        save_config(config)
+        print(f"Storage backend set to {args.set_storage}.")
+        return
+
+    timers = list(map(tuple, args.timer or []))
+    if args.project_name and args.task:
+        timers.insert(0, (args.project_name, args.task))
+    if not timers or (args.timer and args.project_name and not args.task):
         parser.print_help()
         return
+    if len(timers) > MAX_TIMERS:
+        parser.error(f'at most {MAX_TIMERS} timers can run at once')
 
     current_interval = args.interval if args.interval is not None else config.get('interval', 60)
-    run_timer(args.project_name, args.task, current_interval)
+    if args.low_power:
+        refresh_rate = LOW_POWER_REFRESH_RATE
+    elif args.refresh_rate is not None:
+        refresh_rate = args.refresh_rate
+    else:
+        refresh_rate = config.get('refresh_rate', 1.0)
+    if refresh_rate <= 0:
+        parser.error('--refresh-rate must be positive')
+    if len(timers) > 1:
+        run_timers(timers, current_interval, refresh_rate)
+    else:
+        run_timer(*timers[0], current_interval, refresh_rate)
 
 if __name__ == "__main__":
     main()
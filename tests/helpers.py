@@ -0,0 +1,26 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, 'productivity_timer.py')
+
+
+def run(cwd, *args):
+    result = subprocess.run([sys.executable, SCRIPT, *args], cwd=cwd, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def write_sessions(path, project, year, count):
+    entries = [{'project': project, 'task': 'work',
+                'start': f'{year}-03-{day + 1:02d}T09:00:00', 'end': f'{year}-03-{day + 1:02d}T10:00:00'}
+               for day in range(count)]
+    with open(path, 'w') as f:
+        f.write('\n'.join(json.dumps(entry) for entry in entries) + '\n')
+
+
+def project_seconds(cwd, *args):
+    records = [json.loads(line) for line in run(cwd, '--report', '--format', 'ndjson', *args).splitlines()]
+    return {r['project']: r['seconds'] for r in records if r['section'] == 'project'}
@@ -0,0 +1,38 @@
+import datetime
+import subprocess
+import sys
+
+from helpers import ROOT, SCRIPT, project_seconds, run, write_sessions
+
+sys.path.insert(0, ROOT)
+import productivity_timer as pt  # noqa: E402
+
+
+def test_append_during_archiving_is_kept(tmp_path, monkeypatch):
+    write_sessions(tmp_path / 'old.jsonl', 'Old', 2020, 2)
+    write_sessions(tmp_path / 'new.jsonl', 'New', 2026, 2)
+    write_sessions(tmp_path / 'late.jsonl', 'Late', 2026, 1)
+    run(tmp_path, '--import', 'old.jsonl')
+    run(tmp_path, '--import', 'new.jsonl')
+
+    # Append from another process while the archive's sidecars are being saved,
+    # giving it time to finish if the log lock were no longer held
+    appenders = []
+    save_log_index = pt._save_log_index
+
+    def save_and_append(index, index_file):
+        if not appenders:
+            appenders.append(subprocess.Popen([sys.executable, SCRIPT, '--import', 'late.jsonl'], cwd=tmp_path,
+                                              stdout=subprocess.DEVNULL))
+            try:
+                appenders[0].wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                pass
+        save_log_index(index, index_file)
+
+    monkeypatch.setattr(pt, '_save_log_index', save_and_append)
+    archived, kept, _ = pt.archive_log(datetime.date(2021, 1, 1), log_file=str(tmp_path / 'productivity_log.csv'))
+    assert appenders[0].wait(timeout=10) == 0
+
+    assert (archived, kept) == (2, 2)
+    assert project_seconds(tmp_path) == {'Old': 7200, 'New': 7200, 'Late': 3600}
@@ -0,0 +1,29 @@
+import datetime
+import fcntl
+import multiprocessing
+import sys
+import time
+
+from helpers import ROOT
+
+sys.path.insert(0, ROOT)
+import productivity_timer as pt  # noqa: E402
+
+
+def append_after_a_pause(n):
+    # Both writers open the empty log before either takes the lock
+    flock = fcntl.flock
+    fcntl.flock = lambda f, op: (time.sleep(0.3), flock(f, op))
+    start = datetime.datetime(2026, 1, 1, 9 + n)
+    pt.BinaryStorage().append_many([(f'P{n}', 'work', start, start + datetime.timedelta(minutes=30))])
+
+
+def test_first_appends_to_an_empty_log_write_one_header(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    writers = [multiprocessing.get_context('fork').Process(target=append_after_a_pause, args=(n,)) for n in range(2)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+
+    assert sorted(project for project, _, _, _ in pt.BinaryStorage().iter_sessions()) == ['P0', 'P1']
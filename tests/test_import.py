@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from helpers import project_seconds, run, write_sessions
+
+
+def backfill(cwd):
+    """Import 2026 sessions, then older 2020 ones that land after them in the log."""
+    write_sessions(cwd / 'new.jsonl', 'Current', 2026, 3)
+    write_sessions(cwd / 'old.jsonl', 'Backfill', 2020, 2)
+    run(cwd, '--import', 'new.jsonl')
+    run(cwd, '--import', 'old.jsonl')
+    return cwd
+
+
+@pytest.fixture
+def backfilled(tmp_path):
+    return backfill(tmp_path)
+
+
+@pytest.mark.parametrize('backend', ['csv', 'binary', 'partitioned', 'sqlite'])
+def test_backfilled_import_is_found_by_date_windows(tmp_path, backend):
+    run(tmp_path, '--set-storage', backend)
+    backfill(tmp_path)
+
+    assert project_seconds(tmp_path) == {'Current': 10800, 'Backfill': 7200}
+    assert project_seconds(tmp_path, '--until', '2020-12-31') == {'Backfill': 7200}
+    assert project_seconds(tmp_path, '--since', '2020-03-02', '--until', '2020-03-02') == {'Backfill': 3600}
+    assert project_seconds(tmp_path, '--since', '2026-01-01') == {'Current': 10800}
+
+
+def test_backfilled_import_is_found_by_parallel_date_windows(backfilled):
+    assert project_seconds(backfilled, '--until', '2020-12-31', '--jobs', '2') == {'Backfill': 7200}
+
+
+def test_reimport_adds_nothing(backfilled):
+    assert 'Imported 0 sessions' in run(backfilled, '--import', 'old.jsonl')
+    assert project_seconds(backfilled) == {'Current': 10800, 'Backfill': 7200}
+
+
+def test_import_keys_follow_the_storage(backfilled):
+    run(backfilled, '--set-storage', 'sqlite')
+    assert 'Imported 2 sessions' in run(backfilled, '--import', 'old.jsonl')
+
+    run(backfilled, '--set-storage', 'csv')
+    os.unlink(backfilled / 'productivity_log.csv')
+    assert 'Imported 2 sessions' in run(backfilled, '--import', 'old.jsonl')
+    assert project_seconds(backfilled) == {'Backfill': 7200}
+
+
+def test_import_keys_are_dropped_by_migrate(tmp_path):
+    write_sessions(tmp_path / 'a.jsonl', 'A', 2026, 1)
+    write_sessions(tmp_path / 'b.jsonl', 'B', 2025, 1)
+    run(tmp_path, '--import', 'b.jsonl')
+    run(tmp_path, '--set-storage', 'sqlite')
+    run(tmp_path, '--import', 'a.jsonl')
+    run(tmp_path, '--migrate', '--force')  # the SQLite sessions are replaced with the CSV log's
+
+    assert 'Imported 1 sessions' in run(tmp_path, '--import', 'a.jsonl')
+    assert project_seconds(tmp_path) == {'A': 3600, 'B': 3600}
@@ -0,0 +1,15 @@
+from helpers import project_seconds, run, write_sessions
+
+
+def test_migrate_keeps_sessions_logged_to_the_target(tmp_path):
+    write_sessions(tmp_path / 'csv.jsonl', 'Csv', 2025, 2)
+    write_sessions(tmp_path / 'sqlite.jsonl', 'Sqlite', 2026, 1)
+    run(tmp_path, '--import', 'csv.jsonl')
+    run(tmp_path, '--migrate')
+    run(tmp_path, '--import', 'sqlite.jsonl')
+
+    assert 'already holds sessions' in run(tmp_path, '--migrate')
+    assert project_seconds(tmp_path) == {'Csv': 7200, 'Sqlite': 3600}
+
+    assert 'Migrated 2 sessions' in run(tmp_path, '--migrate', '--force')
+    assert project_seconds(tmp_path) == {'Csv': 7200}
@@ -0,0 +1,15 @@
+import json
+
+from helpers import run, write_sessions
+
+
+def test_profile_keeps_machine_readable_reports_parseable(tmp_path):
+    write_sessions(tmp_path / 'a.jsonl', 'A', 2026, 2)
+    run(tmp_path, '--import', 'a.jsonl')
+
+    report = json.loads(run(tmp_path, '--report', '--format', 'json', '--profile', 'prof.json'))
+    assert report
+    assert json.loads((tmp_path / 'prof.json').read_text())['phases']
+
+    for line in run(tmp_path, '--report', '--format', 'ndjson', '--profile').splitlines():
+        json.loads(line)
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+from helpers import project_seconds, run, write_sessions
+
+
+@pytest.mark.parametrize('replace', [True, False], ids=['replaced', 'edited-in-place'])
+def test_rewritten_log_rebuilds_the_index(tmp_path, replace):
+    # The misspelt rows are well before the end of the log
+    write_sessions(tmp_path / 'a.jsonl', 'Porject', 2025, 2)
+    write_sessions(tmp_path / 'b.jsonl', 'Other', 2026, 3)
+    run(tmp_path, '--import', 'a.jsonl')
+    run(tmp_path, '--import', 'b.jsonl')
+    assert project_seconds(tmp_path) == {'Porject': 7200, 'Other': 10800}
+
+    log = tmp_path / 'productivity_log.csv'
+    fixed = log.read_bytes().replace(b'Porject', b'Project')
+    if replace:
+        (tmp_path / 'fixed.csv').write_bytes(fixed)
+        os.replace(tmp_path / 'fixed.csv', log)
+    else:
+        with open(log, 'r+b') as f:
+            f.write(fixed)
+
+    assert project_seconds(tmp_path) == {'Project': 7200, 'Other': 10800}
@@ -0,0 +1,23 @@
+import os
+import shutil
+
+from helpers import project_seconds, run, write_sessions
+
+
+def test_team_report_does_not_write_next_to_teammates_logs(tmp_path):
+    team = tmp_path / 'team'
+    for user, year in (('alice', 2025), ('bob', 2026)):
+        home = tmp_path / user
+        home.mkdir()
+        write_sessions(home / 'a.jsonl', user.title(), year, 2)
+        run(home, '--import', 'a.jsonl')
+        (team / user).mkdir(parents=True)
+        shutil.copy(home / 'productivity_log.csv', team / user / 'productivity_log.csv')
+    os.chmod(team / 'bob', 0o555)
+    try:
+        seconds = project_seconds(tmp_path, '--logs', str(team), '--since', '2025-01-01')
+    finally:
+        os.chmod(team / 'bob', 0o755)
+
+    assert seconds == {'Alice': 7200, 'Bob': 7200}
+    assert sorted(os.listdir(team / 'alice')) == sorted(os.listdir(team / 'bob')) == ['productivity_log.csv']